@@ -1,16 +1,172 @@
+import sys
+import time
+
+
+class Canvas:
+    """Поле символов, которое переиспользуется между перерисовками.
+
+    Клетки хранятся в одном bytearray (по байту на клетку, построчно),
+    а весь кадр выводится одной записью в stdout.
+    """
+
+    def __init__(self, width=40, height=40, background="."):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.pixels = bytearray(background.encode("ascii") * (width * height))
+
+    def clear(self):
+        self.fill(self.background)
+
+    def fill(self, char):
+        # Заполнение на месте без кадра-временника: первый байт размножается
+        # удвоением, копированием уже заполненной части через memoryview
+        size = len(self.pixels)
+        if size == 0:
+            return
+        self.pixels[0] = ord(char)
+        with memoryview(self.pixels) as view:
+            filled = 1
+            while filled < size:
+                step = min(filled, size - filled)
+                view[filled : filled + step] = view[:step]
+                filled += step
+
+    def set_pixel(self, x, y, char="*"):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y * self.width + x] = ord(char)
+
+    def get_pixel(self, x, y):
+        return chr(self.pixels[y * self.width + x])
+
+    def render(self, stream=None):
+        """Собирает кадр целиком и печатает его одним вызовом write."""
+        stream = stream or sys.stdout
+        width = self.width
+        frame = b"\n".join(
+            self.pixels[start : start + width]
+            for start in range(0, len(self.pixels), width)
+        )
+        stream.write(frame.decode("ascii") + "\n")
+        stream.flush()
+
+
 class Figure:
     def __init__(self, x, y):
         self.x = x
         self.y = y
-    
-    def draw(self):
-        field = [['.' for _ in range(40)] for _ in range(40)]
-        if 0 <= self.y < 40 and 0 <= self.x < 40:
-            field[self.y][self.x] = '*'
-        
-        print('Поле 40x40:')
-        for row in field:
-            print(''.join(row))
+        self._canvas = None
+
+    def paint(self, canvas=None):
+        """Рисует фигуру на поле без вывода на экран."""
+        # Поле создаётся один раз и очищается при каждой перерисовке
+        if canvas is None:
+            if self._canvas is None:
+                self._canvas = Canvas(40, 40)
+            canvas = self._canvas
+        canvas.clear()
+        canvas.set_pixel(self.x, self.y, '*')
+        return canvas
+
+    def draw(self, canvas=None):
+        canvas = self.paint(canvas)
+
+        print(f'Поле {canvas.width}x{canvas.height}:')
+        canvas.render()
+
+
+class Animator:
+    """Анимация поля в терминале.
+
+    Хранит предыдущий кадр и выводит только изменившиеся клетки, переставляя
+    курсор ANSI-последовательностями. Первый кадр печатается под уже
+    выведенным текстом, экран не очищается: курсор ходит относительно
+    строки под полем, поэтому прокрутка терминала ничего не сбивает.
+    Частота кадров ограничена fps.
+    В stats копятся число кадров, выведенные байты и время на кадр.
+    """
+
+    def __init__(self, canvas, fps=30, stream=None):
+        self.canvas = canvas
+        self.stream = stream or sys.stdout
+        self.frame_interval = 1 / fps if fps else 0
+        self.stats = {'frames': 0, 'bytes': 0, 'seconds': 0.0}
+        self._previous = None
+        self._last_frame = None
+
+    def _full_frame(self):
+        header = f'Поле {self.canvas.width}x{self.canvas.height}:'
+        width = self.canvas.width
+        rows = [
+            self.canvas.pixels[start:start + width].decode('ascii')
+            for start in range(0, len(self.canvas.pixels), width)
+        ]
+        return '\n'.join([header] + rows) + '\n'
+
+    def _changed_cells(self):
+        # Строки сравниваются срезами целиком, посимвольно — только изменённые.
+        # Курсор стоит в начале строки под полем: поднимаемся к строке,
+        # пишем её изменения и возвращаемся обратно
+        width = self.canvas.width
+        height = self.canvas.height
+        parts = []
+        for row in range(height):
+            start = row * width
+            old_row = self._previous[start:start + width]
+            new_row = self.canvas.pixels[start:start + width]
+            if old_row == new_row:
+                continue
+            parts.append(f'\x1b[{height - row}A')
+            column = 0
+            while column < width:
+                if old_row[column] == new_row[column]:
+                    column += 1
+                    continue
+                run_start = column
+                while column < width and old_row[column] != new_row[column]:
+                    column += 1
+                # ANSI считает столбцы с единицы
+                parts.append(
+                    f'\x1b[{run_start + 1}G'
+                    + new_row[run_start:column].decode('ascii')
+                )
+            parts.append(f'\x1b[{height - row}B\r')
+        return ''.join(parts)
+
+    def show(self):
+        """Выводит текущий кадр: первый целиком, дальше — только разницу."""
+        if self._last_frame is not None and self.frame_interval:
+            delay = self._last_frame + self.frame_interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        start = time.perf_counter()
+        if self._previous is None:
+            output = self._full_frame()
+        else:
+            output = self._changed_cells()
+        if output:
+            self.stream.write(output)
+            self.stream.flush()
+        self._previous = bytes(self.canvas.pixels)
+        self._last_frame = time.perf_counter()
+
+        self.stats['frames'] += 1
+        self.stats['bytes'] += len(output.encode('utf-8'))
+        self.stats['seconds'] += self._last_frame - start
+
+    def finish(self):
+        """Завершает анимацию: курсор и так остаётся в строке под полем."""
+        self.stream.flush()
+
+    def report(self):
+        """Печатает байты и время на кадр в сравнении с полной перерисовкой."""
+        frames = self.stats['frames'] or 1
+        full_size = len(self._full_frame().encode('utf-8'))
+        print(f'Кадров: {self.stats["frames"]}')
+        print(f'Байт на кадр: {self.stats["bytes"] / frames:.0f} '
+              f'(полная перерисовка: {full_size})')
+        print(f'Время на кадр: {self.stats["seconds"] / frames * 1000:.3f} мс')
 
 # 2) Создание объекта фигуры
 fig = Figure(5, 5)
@@ -22,3 +178,14 @@ fig.draw()
 fig.x = 20
 fig.y = 15
 fig.draw()
+
+# 6) Анимация: выводятся только изменившиеся клетки (запуск с ключом --animate)
+if '--animate' in sys.argv:
+    animator = Animator(fig.paint(), fps=20)
+    for step in range(20):
+        fig.x = 20 + step
+        fig.y = 15 + step // 2
+        fig.paint()
+        animator.show()
+    animator.finish()
+    animator.report()
@@ -1,5 +1,8 @@
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
 
 
 @dataclass
@@ -28,6 +31,71 @@ class Cone:
         return (1 / 3) * math.pi * (self.radius ** 2) * self.height
 
 
+@dataclass(frozen=True, slots=True)
+class CachedCone:
+    """Вариант Cone для частого скалярного использования.
+
+    Объект неизменяемый, поэтому образующая, площадь и объем считаются
+    один раз при создании и дальше только читаются из слотов.
+    """
+
+    radius: float
+    height: float
+    slant_height: float = field(init=False, repr=False)
+    area: float = field(init=False, repr=False)
+    volume: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.radius <= 0 or self.height <= 0:
+            raise ValueError("Радиус и высота должны быть больше нуля.")
+        slant_height = math.hypot(self.radius, self.height)
+        object.__setattr__(self, "slant_height", slant_height)
+        object.__setattr__(
+            self, "area", math.pi * self.radius * (self.radius + slant_height)
+        )
+        object.__setattr__(
+            self, "volume", (1 / 3) * math.pi * (self.radius ** 2) * self.height
+        )
+
+
+class ConeBatch:
+    """Много конусов сразу: массивы радиусов и высот вместо объектов.
+
+    Проверка и формулы те же, что у Cone, но считаются над целыми массивами.
+    Производные массивы вычисляются при первом обращении и запоминаются;
+    исходные массивы закрыты от записи, чтобы кэш не устарел.
+    """
+
+    def __init__(self, radius, height):
+        radius, height = np.broadcast_arrays(
+            np.array(radius, dtype=float), np.array(height, dtype=float)
+        )
+        if np.any((radius <= 0) | (height <= 0)):
+            raise ValueError("Радиус и высота должны быть больше нуля.")
+        self.radius = radius.copy()
+        self.height = height.copy()
+        self.radius.flags.writeable = False
+        self.height.flags.writeable = False
+
+    def __len__(self):
+        return self.radius.size
+
+    @cached_property
+    def slant_height(self):
+        """Образующие конусов (l)."""
+        return np.hypot(self.radius, self.height)
+
+    @cached_property
+    def area(self):
+        """Полные площади поверхности."""
+        return math.pi * self.radius * (self.radius + self.slant_height)
+
+    @cached_property
+    def volume(self):
+        """Объемы конусов."""
+        return (1 / 3) * math.pi * (self.radius ** 2) * self.height
+
+
 try:
     cone = Cone(5, 12)
     print(cone)
@@ -36,4 +104,11 @@ try:
     print(f"Образующая: {cone.slant_height:.2f}")
 
 except ValueError as e:
-    print(f"Ошибка: {e}")
\ No newline at end of file
+    print(f"Ошибка: {e}")
+
+# Скалярный вариант с кэшем и пакетный расчет
+cached_cone = CachedCone(5, 12)
+print(cached_cone, f"Площадь: {cached_cone.area:.2f}")
+
+batch = ConeBatch(radius=[5, 3, 1.5], height=[12, 4, 2])
+print(f"Объемы партии: {np.round(batch.volume, 2)}")
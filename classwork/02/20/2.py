@@ -1,15 +1,34 @@
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 
+import numpy as np
 
-@dataclass
+# Все возможные виды треугольника; TriangleBatch хранит номера из этого списка
+TRIANGLE_TYPES = (
+    "равносторонний",
+    "прямоугольный, равнобедренный",
+    "прямоугольный, разносторонний",
+    "тупоугольный, равнобедренный",
+    "тупоугольный, разносторонний",
+    "остроугольный, равнобедренный",
+    "остроугольный, разносторонний",
+)
+
+
+@dataclass(frozen=True, slots=True)
 class Triangle:
     side_a: float
     angle_beta: float
     angle_gamma: float
+    # Решение треугольника: считается один раз в __post_init__
+    angle_alpha: float = field(init=False, repr=False, compare=False)
+    side_b: float = field(init=False, repr=False, compare=False)
+    side_c: float = field(init=False, repr=False, compare=False)
+    triangle_type: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        """Проверка корректности данных после создания объекта."""
+        """Проверка корректности данных и решение треугольника."""
         if self.side_a <= 0:
             raise ValueError("Длина стороны должна быть положительным числом.")
         if self.angle_beta <= 0 or self.angle_gamma <= 0:
@@ -17,34 +36,23 @@ class Triangle:
         if self.angle_beta + self.angle_gamma >= 180:
             raise ValueError("Сумма двух углов должна быть меньше 180 градусов.")
 
-    @property
-    def angle_alpha(self) -> float:
-        """Вычисляет третий угол (противолежащий стороне a)."""
-        return 180 - (self.angle_beta + self.angle_gamma)
-
-    @property
-    def _radians(self) -> tuple[float, float, float]:
-        """Внутренний метод для перевода всех углов в радианы."""
-        return (
-            math.radians(self.angle_alpha),
-            math.radians(self.angle_beta),
-            math.radians(self.angle_gamma)
+        # Объект неизменяемый, поэтому значения можно посчитать заранее
+        angle_alpha = 180 - (self.angle_beta + self.angle_gamma)
+        sin_alpha = math.sin(math.radians(angle_alpha))
+        object.__setattr__(self, "angle_alpha", angle_alpha)
+        object.__setattr__(
+            self,
+            "side_b",
+            (self.side_a * math.sin(math.radians(self.angle_beta))) / sin_alpha,
         )
+        object.__setattr__(
+            self,
+            "side_c",
+            (self.side_a * math.sin(math.radians(self.angle_gamma))) / sin_alpha,
+        )
+        object.__setattr__(self, "triangle_type", self._classify())
 
-    @property
-    def side_b(self) -> float:
-        """Вычисляет сторону b по теореме синусов."""
-        rad_a, rad_b, _ = self._radians
-        return (self.side_a * math.sin(rad_b)) / math.sin(rad_a)
-
-    @property
-    def side_c(self) -> float:
-        """Вычисляет сторону c по теореме синусов."""
-        rad_a, _, rad_g = self._radians
-        return (self.side_a * math.sin(rad_g)) / math.sin(rad_a)
-
-    @property
-    def triangle_type(self) -> str:
+    def _classify(self) -> str:
         """Определяет вид треугольника по углам и сторонам."""
         angles = sorted([self.angle_alpha, self.angle_beta, self.angle_gamma])
 
@@ -69,6 +77,78 @@ class Triangle:
         return f"{angle_kind}, {side_kind}"
 
 
+def _isclose(a, b):
+    """Векторный аналог math.isclose с теми же допусками по умолчанию."""
+    return np.abs(a - b) <= 1e-09 * np.maximum(np.abs(a), np.abs(b))
+
+
+class TriangleBatch:
+    """Решает и классифицирует массивы треугольников (side_a, beta, gamma).
+
+    Проверки и формулы те же, что у Triangle. Вид треугольника хранится
+    как номер в TRIANGLE_TYPES (массив uint8), а не как строка.
+    """
+
+    def __init__(self, side_a, angle_beta, angle_gamma):
+        side_a, angle_beta, angle_gamma = np.broadcast_arrays(
+            np.array(side_a, dtype=float),
+            np.array(angle_beta, dtype=float),
+            np.array(angle_gamma, dtype=float),
+        )
+        if np.any(side_a <= 0):
+            raise ValueError("Длина стороны должна быть положительным числом.")
+        if np.any((angle_beta <= 0) | (angle_gamma <= 0)):
+            raise ValueError("Углы должны быть больше 0 градусов.")
+        if np.any(angle_beta + angle_gamma >= 180):
+            raise ValueError("Сумма двух углов должна быть меньше 180 градусов.")
+
+        self.side_a = side_a.copy()
+        self.angle_beta = angle_beta.copy()
+        self.angle_gamma = angle_gamma.copy()
+        for array in (self.side_a, self.angle_beta, self.angle_gamma):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return self.side_a.size
+
+    @cached_property
+    def angle_alpha(self):
+        return 180 - (self.angle_beta + self.angle_gamma)
+
+    @cached_property
+    def _sin_alpha(self):
+        return np.sin(np.radians(self.angle_alpha))
+
+    @cached_property
+    def side_b(self):
+        return (self.side_a * np.sin(np.radians(self.angle_beta))) / self._sin_alpha
+
+    @cached_property
+    def side_c(self):
+        return (self.side_a * np.sin(np.radians(self.angle_gamma))) / self._sin_alpha
+
+    @cached_property
+    def triangle_type(self):
+        """Номера видов в TRIANGLE_TYPES для каждого треугольника."""
+        smallest, middle, largest = np.sort(
+            np.stack([self.angle_alpha, self.angle_beta, self.angle_gamma]), axis=0
+        )
+
+        right = _isclose(smallest, 90) | _isclose(middle, 90) | _isclose(largest, 90)
+        obtuse = ~right & (largest > 90)
+        # 0 — прямоугольный, 1 — тупоугольный, 2 — остроугольный
+        angle_kind = np.where(right, 0, np.where(obtuse, 1, 2))
+        isosceles = _isclose(smallest, middle) | _isclose(middle, largest)
+
+        codes = 1 + angle_kind * 2 + np.where(isosceles, 0, 1)
+        codes = np.where(_isclose(smallest, largest), 0, codes)
+        return codes.astype(np.uint8)
+
+    def type_names(self):
+        """Виды треугольников строками, как у Triangle.triangle_type."""
+        return np.array(TRIANGLE_TYPES)[self.triangle_type]
+
+
 # --- Блок тестирования ---
 try:
     # Пример 1: Прямоугольный равнобедренный треугольник
@@ -81,7 +161,16 @@ try:
 
     print("-" * 30)
 
-    # Пример 2: Проверка ошибки
+    # Пример 2: Пакетный расчет
+    batch = TriangleBatch(
+        side_a=[10, 5, 7], angle_beta=[45, 60, 30], angle_gamma=[45, 60, 20]
+    )
+    print(f"Стороны b: {np.round(batch.side_b, 2)}")
+    print(f"Типы: {batch.type_names().tolist()}")
+
+    print("-" * 30)
+
+    # Пример 3: Проверка ошибки
     # tri_error = Triangle(10, 90, 90)
 
 except ValueError as e:
@@ -1,24 +1,115 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Частоты букв русского языка (%)
+RUSSIAN_FREQUENCIES = {
+    "а": 8.01,
+    "б": 1.59,
+    "в": 4.54,
+    "г": 1.70,
+    "д": 2.98,
+    "е": 8.45,
+    "ё": 0.04,
+    "ж": 0.94,
+    "з": 1.65,
+    "и": 7.35,
+    "й": 1.21,
+    "к": 3.49,
+    "л": 4.40,
+    "м": 3.21,
+    "н": 6.70,
+    "о": 10.97,
+    "п": 2.81,
+    "р": 4.73,
+    "с": 5.47,
+    "т": 6.26,
+    "у": 2.62,
+    "ф": 0.26,
+    "х": 0.97,
+    "ц": 0.48,
+    "ч": 1.44,
+    "ш": 0.73,
+    "щ": 0.36,
+    "ъ": 0.04,
+    "ы": 1.90,
+    "ь": 1.74,
+    "э": 0.32,
+    "ю": 0.64,
+    "я": 2.01,
+}
+# Сколько букв добавляется к гистограмме между проверками на досрочную победу
+CRACK_BLOCK_SIZE = 4096
+
+
+@lru_cache(maxsize=128)
+def _build_table(alphabet, shift):
+    """Таблица перевода для str.translate: строится один раз на пару (алфавит, сдвиг)."""
+    shifted = alphabet[shift:] + alphabet[:shift]
+    return str.maketrans(alphabet, shifted)
+
+
+@lru_cache(maxsize=8)
+def _index_lookup(alphabet):
+    """Таблица «код символа -> индекс в алфавите» (-1 для прочих символов)."""
+    lookup = np.full(max(map(ord, alphabet)) + 1, -1, dtype=np.int64)
+    for index, char in enumerate(alphabet):
+        lookup[ord(char)] = index
+    return lookup
+
+
+def _text_to_indices(alphabet, text):
+    """Переводит текст в массив индексов букв алфавита, отбрасывая остальное."""
+    lookup = _index_lookup(alphabet)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    codes = codes[codes < len(lookup)]
+    indices = lookup[codes]
+    return indices[indices >= 0]
+
+
+@lru_cache(maxsize=8)
+def _score_matrix(alphabet):
+    """Матрица 33x33: строка s — логарифмы частот для букв шифротекста при сдвиге s."""
+    frequencies = np.array([RUSSIAN_FREQUENCIES[char] for char in alphabet])
+    log_frequencies = np.log(frequencies / 100)
+    # При сдвиге s буква k шифротекста — это буква (k - s) открытого текста
+    return np.stack([np.roll(log_frequencies, s) for s in range(len(alphabet))])
+
+
 class CipherMaster:
     alphabet = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
 
     def cipher(self, original_text, shift):
+        # Вместо поиска каждой буквы в алфавите — один проход str.translate
+        table = _build_table(self.alphabet, shift % len(self.alphabet))
+        return original_text.lower().translate(table)
 
-        original_text = original_text.lower()
-        result = []
+    def decipher(self, cipher_text, shift):
+        return self.cipher(cipher_text, -shift)
 
-        for char in original_text:
-            if char in self.alphabet:
-                index = self.alphabet.find(char)
-                new_index = (index + shift) % len(self.alphabet)
-                result.append(self.alphabet[new_index])
+    def crack(self, cipher_text, confidence=50.0):
+        """Подбирает сдвиг для decipher частотным анализом.
 
-            else:
-                result.append(char)
+        Текст один раз переводится в массив индексов букв, затем все 33 сдвига
+        оцениваются разом: гистограмма шифротекста умножается на матрицу
+        логарифмов частот для каждого сдвига. Длинный текст считается блоками,
+        и как только лучший сдвиг опережает второй на confidence (в логарифмах
+        правдоподобия), оставшаяся часть не обрабатывается.
+        """
+        indices = _text_to_indices(self.alphabet, cipher_text.lower())
+        score_matrix = _score_matrix(self.alphabet)
+        counts = np.zeros(len(self.alphabet), dtype=np.int64)
+        scores = score_matrix @ counts
 
-        return "".join(result)
+        for start in range(0, len(indices), CRACK_BLOCK_SIZE):
+            block = indices[start : start + CRACK_BLOCK_SIZE]
+            counts += np.bincount(block, minlength=len(self.alphabet))
+            scores = score_matrix @ counts
+            second, best = np.partition(scores, -2)[-2:]
+            if best - second >= confidence:
+                break
 
-    def decipher(self, cipher_text, shift):
-        return self.cipher(cipher_text, -shift)
+        return int(np.argmax(scores))
 
 
 # Пример запуска
@@ -37,3 +128,8 @@ print(
         shift=-3,
     )
 )
+
+cipher_text = "Олебэи яфвнэ мроплж сэжи — э пэй рдв злййвкпш лп нвящывнэ"
+found_shift = cipher_master.crack(cipher_text)
+print(f"Подобранный сдвиг: {found_shift}")
+print(cipher_master.decipher(cipher_text, found_shift))
@@ -1,7 +1,230 @@
+import codecs
+import contextlib
+import io
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
+# Размер куска для потоковой обработки (в символах или байтах — зависит от потока)
+CHUNK_SIZE = 1 << 20
+# Сколько сообщений (или файлов) уходит в процесс-обработчик одной задачей
+BATCH_CHUNK_SIZE = 1000
+
+
+@lru_cache(maxsize=128)
+def _build_table(alphabet, shift):
+    """Таблица перевода для str.translate: строится один раз на пару (алфавит, сдвиг)."""
+    shifted = alphabet[shift:] + alphabet[:shift]
+    return str.maketrans(alphabet, shifted)
+
+
+@lru_cache(maxsize=128)
+def _build_byte_table(alphabet, shift, encoding):
+    """Таблица из 256 байт для bytes.translate в однобайтовой кодировке.
+
+    Повторяет process_text: байт заглавной буквы переходит в строчную,
+    буквы алфавита сдвигаются, остальные байты остаются как есть.
+    """
+    shifted = alphabet[shift:] + alphabet[:shift]
+    table = bytearray(range(256))
+    for byte in range(256):
+        try:
+            char = bytes([byte]).decode(encoding).lower()
+        except UnicodeDecodeError:
+            continue
+        if char in alphabet:
+            char = shifted[alphabet.index(char)]
+        try:
+            encoded = char.encode(encoding)
+        except UnicodeEncodeError:
+            continue
+        if len(encoded) == 1:
+            table[byte] = encoded[0]
+    return bytes(table)
+
+
 class CipherMaster:
     alphabet = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
 
+    def _get_table(self, shift):
+        # Сдвиг приводим по модулю заранее, чтобы 2 и 35 попадали в один элемент кэша
+        return _build_table(self.alphabet, shift % len(self.alphabet))
+
     def process_text(self, text, shift, is_encrypt):
+        if not is_encrypt:
+            shift = -shift
+        return text.lower().translate(self._get_table(shift))
+
+    def process_bytes(self, data, shift, is_encrypt, encoding="cp1251"):
+        """То же, что process_text, но для байтов в однобайтовой кодировке."""
+        if not is_encrypt:
+            shift = -shift
+        table = _build_byte_table(self.alphabet, shift % len(self.alphabet), encoding)
+        return data.translate(table)
+
+    def process_mapped_file(
+        self,
+        source,
+        destination,
+        shift,
+        is_encrypt,
+        encoding="cp1251",
+        chunk_size=CHUNK_SIZE,
+    ):
+        """Шифрует файл в cp1251/koi8-r через mmap, не декодируя его в str.
+
+        Входной и выходной файлы отображаются в память, и байты переводятся
+        таблицей кусками по chunk_size, так что в памяти нет ни строк, ни копии
+        файла целиком. Возвращает количество обработанных байт.
+        Файлы должны различаться: открытие на запись обнулило бы исходник.
+        """
+        if os.path.exists(destination) and os.path.samefile(source, destination):
+            raise ValueError("destination не должен совпадать с source")
+        if not is_encrypt:
+            shift = -shift
+        table = _build_byte_table(self.alphabet, shift % len(self.alphabet), encoding)
+        size = os.path.getsize(source)
+
+        with open(source, "rb") as input_file, open(destination, "w+b") as output_file:
+            output_file.truncate(size)
+            if size == 0:
+                return 0  # Пустой файл отобразить в память нельзя
+            with (
+                mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as input_map,
+                mmap.mmap(output_file.fileno(), size) as output_map,
+            ):
+                for start in range(0, size, chunk_size):
+                    end = min(start + chunk_size, size)
+                    output_map[start:end] = input_map[start:end].translate(table)
+        return size
+
+    def iter_process_stream(
+        self, source, shift, is_encrypt, chunk_size=CHUNK_SIZE, encoding="utf-8"
+    ):
+        """Генератор: читает текст кусками и отдаёт обработанные куски.
+
+        source — путь к файлу, текстовый или бинарный поток. Для бинарных потоков
+        байты декодируются инкрементально, поэтому многобайтовая кириллица,
+        разрезанная границей куска, собирается правильно.
+        """
+        with contextlib.ExitStack() as stack:
+            stream = source
+            if isinstance(source, (str, os.PathLike)):
+                stream = stack.enter_context(
+                    open(source, encoding=encoding, newline="")
+                )
+            if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+                decoder = codecs.getincrementaldecoder(encoding)()
+                while chunk := stream.read(chunk_size):
+                    yield self.process_text(decoder.decode(chunk), shift, is_encrypt)
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    yield self.process_text(tail, shift, is_encrypt)
+            else:
+                # Текстовый поток сам декодирует байты и отдаёт целые символы
+                while chunk := stream.read(chunk_size):
+                    yield self.process_text(chunk, shift, is_encrypt)
+
+    def process_stream(
+        self,
+        source,
+        destination,
+        shift,
+        is_encrypt,
+        chunk_size=CHUNK_SIZE,
+        encoding="utf-8",
+    ):
+        """Шифрует/расшифровывает поток или файл целиком, держа в памяти один кусок.
+
+        destination — путь к файлу или текстовый поток для записи.
+        Возвращает количество записанных символов.
+        """
+        written = 0
+        with contextlib.ExitStack() as stack:
+            output = destination
+            if isinstance(destination, (str, os.PathLike)):
+                output = stack.enter_context(
+                    open(destination, "w", encoding=encoding, newline="")
+                )
+            for chunk in self.iter_process_stream(
+                source, shift, is_encrypt, chunk_size, encoding
+            ):
+                written += output.write(chunk)
+        return written
+
+    def process_batch(
+        self,
+        texts,
+        shift,
+        is_encrypt,
+        workers=None,
+        chunk_size=BATCH_CHUNK_SIZE,
+    ):
+        """Обрабатывает набор текстов в пуле процессов.
+
+        Возвращает (результаты в порядке входа, статистика по процессам).
+        """
+        chunks = _split_chunks(texts, chunk_size)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map сохраняет порядок задач, поэтому куски склеиваются как были
+            reports = list(
+                executor.map(
+                    _process_chunk,
+                    [(self, chunk, shift, is_encrypt) for chunk in chunks],
+                )
+            )
+
+        results = []
+        for _, _, _, _, chunk_results in reports:
+            results.extend(chunk_results)
+        return results, _collect_worker_stats(reports)
+
+    def process_directory(
+        self,
+        source_dir,
+        destination_dir,
+        shift,
+        is_encrypt,
+        workers=None,
+        chunk_size=1,
+    ):
+        """Обрабатывает все файлы каталога в пуле процессов.
+
+        Каждый файл шифруется потоково, результат пишется в destination_dir
+        под тем же именем. Возвращает (пути результатов по порядку, статистика).
+        Каталоги должны различаться: запись поверх исходника затерла бы его
+        до чтения.
+        """
+        names = sorted(
+            entry.name for entry in os.scandir(source_dir) if entry.is_file()
+        )
+        os.makedirs(destination_dir, exist_ok=True)
+        if os.path.samefile(source_dir, destination_dir):
+            raise ValueError("destination_dir не должен совпадать с source_dir")
+        pairs = [
+            (os.path.join(source_dir, name), os.path.join(destination_dir, name))
+            for name in names
+        ]
+        chunks = _split_chunks(pairs, chunk_size)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(
+                executor.map(
+                    _process_files_chunk,
+                    [(self, chunk, shift, is_encrypt) for chunk in chunks],
+                )
+            )
+
+        results = []
+        for _, _, _, _, chunk_results in reports:
+            results.extend(chunk_results)
+        return results, _collect_worker_stats(reports)
+
+    def _process_text_loop(self, text, shift, is_encrypt):
+        """Исходная посимвольная реализация — оставлена как эталон для проверки и замеров."""
         text = text.lower()
         if not is_encrypt:
             shift = -shift
@@ -17,19 +240,128 @@ class CipherMaster:
         return "".join(result)
 
 
+def _split_chunks(items, chunk_size):
+    """Режет любой итерируемый объект на списки по chunk_size элементов."""
+    iterator = iter(items)
+    chunks = []
+    while chunk := list(islice(iterator, chunk_size)):
+        chunks.append(chunk)
+    return chunks
+
+
+def _process_chunk(task):
+    """Задача процесса-обработчика: шифрует кусок сообщений и меряет своё время."""
+    cipher_master, texts, shift, is_encrypt = task
+    start = time.perf_counter()
+    results = [cipher_master.process_text(text, shift, is_encrypt) for text in texts]
+    size = sum(len(text.encode("utf-8")) for text in texts)
+    return os.getpid(), len(texts), size, time.perf_counter() - start, results
+
+
+def _process_files_chunk(task):
+    """Задача процесса-обработчика: потоково шифрует кусок файлов."""
+    cipher_master, pairs, shift, is_encrypt = task
+    start = time.perf_counter()
+    results = []
+    size = 0
+    for source, destination in pairs:
+        cipher_master.process_stream(source, destination, shift, is_encrypt)
+        size += os.path.getsize(source)
+        results.append(destination)
+    return os.getpid(), len(pairs), size, time.perf_counter() - start, results
+
+
+def _collect_worker_stats(reports):
+    """Сводит отчёты задач в статистику по каждому процессу."""
+    stats = {}
+    for pid, count, size, seconds, _ in reports:
+        worker = stats.setdefault(
+            pid, {"tasks": 0, "items": 0, "bytes": 0, "seconds": 0.0}
+        )
+        worker["tasks"] += 1
+        worker["items"] += count
+        worker["bytes"] += size
+        worker["seconds"] += seconds
+
+    for worker in stats.values():
+        seconds = worker["seconds"] or float("inf")
+        worker["items_per_sec"] = worker["items"] / seconds
+        worker["mb_per_sec"] = worker["bytes"] / (1024 * 1024) / seconds
+    return stats
+
+
+def print_worker_stats(stats):
+    """Печатает пропускную способность каждого процесса."""
+    print("\nПропускная способность по процессам:")
+    for pid, worker in sorted(stats.items()):
+        print(
+            f" PID {pid}: задач {worker['tasks']}, элементов {worker['items']}, "
+            f"{worker['items_per_sec']:.0f} эл./с, {worker['mb_per_sec']:.1f} МБ/с"
+        )
+
+
+def benchmark(size_mb=4, shift=2):
+    """Сравнивает скорость (МБ/с) табличного движка и посимвольного цикла."""
+    cipher_master = CipherMaster()
+    sample = "Однажды ревьюер принял проект с первого раза, с тех пор я его боюсь. "
+    text = sample * (size_mb * 1024 * 1024 // len(sample.encode("utf-8")))
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+
+    timings = {}
+    results = {}
+    for name, method in (
+        ("цикл", cipher_master._process_text_loop),
+        ("translate", cipher_master.process_text),
+    ):
+        start = time.perf_counter()
+        results[name] = method(text, shift, True)
+        timings[name] = time.perf_counter() - start
+
+    assert results["цикл"] == results["translate"]
+
+    print(f"\nЗамер на {megabytes:.1f} МБ текста:")
+    for name in ("цикл", "translate"):
+        print(f" {name}: {megabytes / timings[name]:.1f} МБ/с")
+    print(f" Ускорение: x{timings['цикл'] / timings['translate']:.1f}")
+
+
 # Проверка
-cipher_master = CipherMaster()
-print(
-    cipher_master.process_text(
-        text="Однажды ревьюер принял проект с первого раза, с тех пор я его боюсь",
-        shift=2,
-        is_encrypt=True,
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    # Пакетный режим: сообщения делятся между процессами, порядок сохраняется
+    messages = [f"Сообщение номер {i} для пакетной обработки" for i in range(20000)]
+    encrypted, stats = CipherMaster().process_batch(
+        messages, shift=2, is_encrypt=True, workers=4
+    )
+    print(encrypted[0])
+    print_worker_stats(stats)
+
+    benchmark()
+elif __name__ == "__main__":
+    cipher_master = CipherMaster()
+    print(
+        cipher_master.process_text(
+            text="Однажды ревьюер принял проект с первого раза, с тех пор я его боюсь",
+            shift=2,
+            is_encrypt=True,
+        )
     )
-)
-print(
-    cipher_master.process_text(
-        text="Олебэи яфвнэ мроплж сэжи — э пэй рдв злййвкпш лп нвящывнэ",
-        shift=-3,
-        is_encrypt=False,
+    print(
+        cipher_master.process_text(
+            text="Олебэи яфвнэ мроплж сэжи — э пэй рдв злййвкпш лп нвящывнэ",
+            shift=-3,
+            is_encrypt=False,
+        )
+    )
+
+    # Потоковый режим: файл любого размера обрабатывается кусками
+    source = io.StringIO("Однажды ревьюер принял проект с первого раза\n" * 3)
+    destination = io.StringIO()
+    cipher_master.process_stream(source, destination, shift=2, is_encrypt=True)
+    print(destination.getvalue(), end="")
+
+    # Байтовый режим: архив в cp1251 шифруется без перевода в str
+    print(
+        cipher_master.process_bytes(
+            "Однажды ревьюер".encode("cp1251"), shift=2, is_encrypt=True
+        ).decode("cp1251")
     )
-)
@@ -1,6 +1,140 @@
+import sys
+
+
+class Canvas:
+    """Поле символов, которое переиспользуется между перерисовками.
+
+    Клетки хранятся в одном bytearray (по байту на клетку, построчно),
+    а весь кадр выводится одной записью в stdout.
+    """
+
+    def __init__(self, width=40, height=40, background="."):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.pixels = bytearray(background.encode("ascii") * (width * height))
+
+    def clear(self):
+        self.fill(self.background)
+
+    def fill(self, char):
+        # Заполнение на месте без кадра-временника: первый байт размножается
+        # удвоением, копированием уже заполненной части через memoryview
+        size = len(self.pixels)
+        if size == 0:
+            return
+        self.pixels[0] = ord(char)
+        with memoryview(self.pixels) as view:
+            filled = 1
+            while filled < size:
+                step = min(filled, size - filled)
+                view[filled : filled + step] = view[:step]
+                filled += step
+
+    def set_pixel(self, x, y, char="*"):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y * self.width + x] = ord(char)
+
+    def get_pixel(self, x, y):
+        return chr(self.pixels[y * self.width + x])
+
+    def render(self, stream=None):
+        """Собирает кадр целиком и печатает его одним вызовом write."""
+        stream = stream or sys.stdout
+        width = self.width
+        frame = b"\n".join(
+            self.pixels[start : start + width]
+            for start in range(0, len(self.pixels), width)
+        )
+        stream.write(frame.decode("ascii") + "\n")
+        stream.flush()
+
+
+def _minor_steps(step, major, minor):
+    """Сколько шагов по второстепенной оси сделал Брезенхем за step итераций."""
+    if major == 0:
+        return 0
+    # ceil((2 * step * minor - major) / (2 * major)) в целых числах
+    return -((major - 2 * step * minor) // (2 * major))
+
+
+def _line_point(step, start_x, start_y, step_x, step_y, distance_x, distance_y):
+    """Точка и накопленная ошибка Брезенхема после step итераций — без цикла."""
+    if distance_x >= distance_y:
+        moves_x = step
+        moves_y = _minor_steps(step, distance_x, distance_y)
+    else:
+        moves_x = _minor_steps(step, distance_y, distance_x)
+        moves_y = step
+    accumulated_error = distance_x - distance_y - moves_x * distance_y
+    accumulated_error += moves_y * distance_x
+    return (
+        start_x + step_x * moves_x,
+        start_y + step_y * moves_y,
+        accumulated_error,
+    )
+
+
+def _clip_steps(canvas, start_x, start_y, step_x, step_y, distance_x, distance_y):
+    """Отсечение отрезка по полю (в духе Лианга — Барски, но в номерах шагов).
+
+    Обе координаты точки монотонны по номеру итерации, поэтому итерации,
+    на которых точка внутри поля, образуют отрезок [first, last]. Его границы
+    находятся двоичным поиском, так что далёкие вершины не стоят ничего.
+    Возвращает (first, last) или None, если на поле ничего не попадает.
+    """
+    total = max(distance_x, distance_y)
+    origin = (start_x, start_y)
+
+    def moved(step, axis, step_sign):
+        # Сдвиг точки вдоль оси к шагу step, в сторону движения (не убывает)
+        point = _line_point(
+            step, start_x, start_y, step_x, step_y, distance_x, distance_y
+        )
+        return step_sign * (point[axis] - origin[axis])
+
+    def first_step(axis, step_sign, bound, strict):
+        # Первая итерация, на которой сдвиг достиг bound (при strict —
+        # превысил его), или total + 1, если такой нет
+        left, right = 0, total + 1
+        while left < right:
+            middle = (left + right) // 2
+            shift = moved(middle, axis, step_sign)
+            if shift > bound or (not strict and shift == bound):
+                right = middle
+            else:
+                left = middle + 1
+        return left
+
+    first, last = 0, total
+    for axis, start, step_sign, size in (
+        (0, start_x, step_x, canvas.width),
+        (1, start_y, step_y, canvas.height),
+    ):
+        # Сдвиг вдоль оси не убывает; в поле он должен лежать в [low, high]
+        if step_sign > 0:
+            low, high = -start, size - 1 - start
+        else:
+            low, high = start - (size - 1), start
+        first = max(first, first_step(axis, step_sign, low, strict=False))
+        last = min(last, first_step(axis, step_sign, high, strict=True) - 1)
+
+    if first > last:
+        return None
+    return first, last
+
+
 class Triangle:
     def __init__(
-        self, vertex_a_x, vertex_a_y, vertex_b_x, vertex_b_y, vertex_c_x, vertex_c_y
+        self,
+        vertex_a_x,
+        vertex_a_y,
+        vertex_b_x,
+        vertex_b_y,
+        vertex_c_x,
+        vertex_c_y,
+        canvas_width=40,
+        canvas_height=40,
     ):
         self.vertex_a_x = vertex_a_x
         self.vertex_a_y = vertex_a_y
@@ -8,24 +142,31 @@ class Triangle:
         self.vertex_b_y = vertex_b_y
         self.vertex_c_x = vertex_c_x
         self.vertex_c_y = vertex_c_y
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self._canvas = None
 
     def _draw_outline(self, canvas, start_x, start_y, end_x, end_y):
-        current_x = start_x
-        current_y = start_y
         distance_x = abs(end_x - start_x)
         distance_y = abs(end_y - start_y)
 
         step_x = 1 if start_x < end_x else -1
         step_y = 1 if start_y < end_y else -1
 
-        accumulated_error = distance_x - distance_y
+        # Сначала отсекаем отрезок по полю, а рисуем только видимую часть
+        visible = _clip_steps(
+            canvas, start_x, start_y, step_x, step_y, distance_x, distance_y
+        )
+        if visible is None:
+            return
+        first_step, last_step = visible
 
-        while True:
-            if 0 <= current_y < 40 and 0 <= current_x < 40:
-                canvas[current_y][current_x] = "*"
+        current_x, current_y, accumulated_error = _line_point(
+            first_step, start_x, start_y, step_x, step_y, distance_x, distance_y
+        )
 
-            if current_x == end_x and current_y == end_y:
-                break
+        for _ in range(last_step - first_step + 1):
+            canvas.set_pixel(current_x, current_y, "*")
 
             double_error = accumulated_error * 2
 
@@ -37,9 +178,17 @@ class Triangle:
                 accumulated_error += distance_x
                 current_y += step_y
 
+    def _get_canvas(self, canvas):
+        # Без явного поля используем своё, созданное один раз
+        if canvas is None:
+            if self._canvas is None:
+                self._canvas = Canvas(self.canvas_width, self.canvas_height)
+            canvas = self._canvas
+        canvas.clear()
+        return canvas
 
-    def draw(self):
-        canvas = [["." for _ in range(40)] for _ in range(40)]
+    def draw(self, canvas=None):
+        canvas = self._get_canvas(canvas)
 
         self._draw_outline(
             canvas, self.vertex_a_x, self.vertex_a_y, self.vertex_b_x, self.vertex_b_y
@@ -51,9 +200,8 @@ class Triangle:
             canvas, self.vertex_c_x, self.vertex_c_y, self.vertex_a_x, self.vertex_a_y
         )
 
-        print("\nПоле 40x40 (Треугольник):")
-        for row in canvas:
-            print("".join(row))
+        print(f"\nПоле {canvas.width}x{canvas.height} (Треугольник):")
+        canvas.render()
 
 
 filled_triangle = Triangle(20, 5, 5, 30, 35, 30)
@@ -1,9 +1,161 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
 import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Предел на число вычисляемых за раз значений (треугольники x пиксели тайла)
+BATCH_CELL_LIMIT = 1 << 22
+# Сколько байт строк поля на диске отображается в память за раз
+MEMMAP_BAND_BYTES = 16 << 20
+
+# Цвета клеток в окне: по байту клетки берётся RGB из палитры
+PALETTE = np.zeros((256, 3), dtype=np.uint8)
+PALETTE[:] = (0x1E, 0x1E, 0x1E)
+PALETTE[ord("*")] = (0x2C, 0xCD, 0xD2)
+
+
+class Canvas:
+    """Поле символов, которое переиспользуется между перерисовками.
+
+    Клетки хранятся в одном bytearray (по байту на клетку, построчно),
+    а весь кадр выводится одной записью в stdout. Вместо своего bytearray
+    можно передать готовый буфер pixels, например общую память процессов.
+    """
+
+    def __init__(self, width=40, height=40, background=".", pixels=None):
+        self.width = width
+        self.height = height
+        self.background = background
+        if pixels is None:
+            pixels = bytearray(background.encode("ascii") * (width * height))
+        self.pixels = pixels
+
+    def clear(self):
+        self.fill(self.background)
+
+    def fill(self, char):
+        # Заполнение на месте: NumPy-представление того же буфера, без копий
+        np.frombuffer(self.pixels, dtype=np.uint8).fill(ord(char))
+
+    def set_pixel(self, x, y, char="*"):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y * self.width + x] = ord(char)
+
+    def get_pixel(self, x, y):
+        return chr(self.pixels[y * self.width + x])
+
+    def fill_span(self, y, start_x, end_x, char="*"):
+        """Закрашивает отрезок строки [start_x, end_x] одним присваиванием среза."""
+        start_x = max(start_x, 0)
+        end_x = min(end_x, self.width - 1)
+        if 0 <= y < self.height and start_x <= end_x:
+            offset = y * self.width
+            span = char.encode("ascii") * (end_x - start_x + 1)
+            self.pixels[offset + start_x : offset + end_x + 1] = span
+
+    def render(self, stream=None):
+        """Собирает кадр целиком и печатает его одним вызовом write."""
+        stream = stream or sys.stdout
+        width = self.width
+        frame = b"\n".join(
+            self.pixels[start : start + width]
+            for start in range(0, len(self.pixels), width)
+        )
+        stream.write(frame.decode("ascii") + "\n")
+        stream.flush()
+
+
+def _minor_steps(step, major, minor):
+    """Сколько шагов по второстепенной оси сделал Брезенхем за step итераций."""
+    if major == 0:
+        return 0
+    # ceil((2 * step * minor - major) / (2 * major)) в целых числах
+    return -((major - 2 * step * minor) // (2 * major))
+
+
+def _line_point(step, start_x, start_y, step_x, step_y, distance_x, distance_y):
+    """Точка и накопленная ошибка Брезенхема после step итераций — без цикла."""
+    if distance_x >= distance_y:
+        moves_x = step
+        moves_y = _minor_steps(step, distance_x, distance_y)
+    else:
+        moves_x = _minor_steps(step, distance_y, distance_x)
+        moves_y = step
+    accumulated_error = distance_x - distance_y - moves_x * distance_y
+    accumulated_error += moves_y * distance_x
+    return (
+        start_x + step_x * moves_x,
+        start_y + step_y * moves_y,
+        accumulated_error,
+    )
+
+
+def _clip_steps(canvas, start_x, start_y, step_x, step_y, distance_x, distance_y):
+    """Отсечение отрезка по полю (в духе Лианга — Барски, но в номерах шагов).
+
+    Обе координаты точки монотонны по номеру итерации, поэтому итерации,
+    на которых точка внутри поля, образуют отрезок [first, last]. Его границы
+    находятся двоичным поиском, так что далёкие вершины не стоят ничего.
+    Возвращает (first, last) или None, если на поле ничего не попадает.
+    """
+    total = max(distance_x, distance_y)
+    origin = (start_x, start_y)
+
+    def moved(step, axis, step_sign):
+        # Сдвиг точки вдоль оси к шагу step, в сторону движения (не убывает)
+        point = _line_point(
+            step, start_x, start_y, step_x, step_y, distance_x, distance_y
+        )
+        return step_sign * (point[axis] - origin[axis])
+
+    def first_step(axis, step_sign, bound, strict):
+        # Первая итерация, на которой сдвиг достиг bound (при strict —
+        # превысил его), или total + 1, если такой нет
+        left, right = 0, total + 1
+        while left < right:
+            middle = (left + right) // 2
+            shift = moved(middle, axis, step_sign)
+            if shift > bound or (not strict and shift == bound):
+                right = middle
+            else:
+                left = middle + 1
+        return left
+
+    first, last = 0, total
+    for axis, start, step_sign, size in (
+        (0, start_x, step_x, canvas.width),
+        (1, start_y, step_y, canvas.height),
+    ):
+        # Сдвиг вдоль оси не убывает; в поле он должен лежать в [low, high]
+        if step_sign > 0:
+            low, high = -start, size - 1 - start
+        else:
+            low, high = start - (size - 1), start
+        first = max(first, first_step(axis, step_sign, low, strict=False))
+        last = min(last, first_step(axis, step_sign, high, strict=True) - 1)
+
+    if first > last:
+        return None
+    return first, last
 
 
 class Triangle:
     def __init__(
-        self, vertex_a_x, vertex_a_y, vertex_b_x, vertex_b_y, vertex_c_x, vertex_c_y
+        self,
+        vertex_a_x,
+        vertex_a_y,
+        vertex_b_x,
+        vertex_b_y,
+        vertex_c_x,
+        vertex_c_y,
+        canvas_width=40,
+        canvas_height=40,
     ):
         self.vertex_a_x = vertex_a_x
         self.vertex_a_y = vertex_a_y
@@ -11,24 +163,39 @@ class Triangle:
         self.vertex_b_y = vertex_b_y
         self.vertex_c_x = vertex_c_x
         self.vertex_c_y = vertex_c_y
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self._canvas = None
+
+    def move(self, dx, dy):
+        self.vertex_a_x += dx
+        self.vertex_a_y += dy
+        self.vertex_b_x += dx
+        self.vertex_b_y += dy
+        self.vertex_c_x += dx
+        self.vertex_c_y += dy
 
     def _draw_outline(self, canvas, start_x, start_y, end_x, end_y):
-        current_x = start_x
-        current_y = start_y
         distance_x = abs(end_x - start_x)
         distance_y = abs(end_y - start_y)
 
         step_x = 1 if start_x < end_x else -1
         step_y = 1 if start_y < end_y else -1
 
-        accumulated_error = distance_x - distance_y
+        # Сначала отсекаем отрезок по полю, а рисуем только видимую часть
+        visible = _clip_steps(
+            canvas, start_x, start_y, step_x, step_y, distance_x, distance_y
+        )
+        if visible is None:
+            return
+        first_step, last_step = visible
 
-        while True:
-            if 0 <= current_y < 40 and 0 <= current_x < 40:
-                canvas[current_y][current_x] = "*"
+        current_x, current_y, accumulated_error = _line_point(
+            first_step, start_x, start_y, step_x, step_y, distance_x, distance_y
+        )
 
-            if current_x == end_x and current_y == end_y:
-                break
+        for _ in range(last_step - first_step + 1):
+            canvas.set_pixel(current_x, current_y, "*")
 
             double_error = accumulated_error * 2
 
@@ -40,8 +207,21 @@ class Triangle:
                 accumulated_error += distance_x
                 current_y += step_y
 
-    def get_grid(self):
-        canvas = [["." for _ in range(40)] for _ in range(40)]
+    def _get_canvas(self, canvas):
+        # Без явного поля используем своё, созданное один раз
+        if canvas is None:
+            if self._canvas is None:
+                self._canvas = Canvas(self.canvas_width, self.canvas_height)
+            canvas = self._canvas
+        canvas.clear()
+        return canvas
+
+    def get_grid(self, canvas=None):
+        canvas = self._get_canvas(canvas)
+        return self.draw_outline(canvas)
+
+    def draw_outline(self, canvas):
+        """Рисует контур поверх того, что уже есть на поле."""
         self._draw_outline(
             canvas, self.vertex_a_x, self.vertex_a_y, self.vertex_b_x, self.vertex_b_y
         )
@@ -55,9 +235,13 @@ class Triangle:
 
     def _fill_area(self, canvas):
         min_x = max(0, min(self.vertex_a_x, self.vertex_b_x, self.vertex_c_x))
-        max_x = min(39, max(self.vertex_a_x, self.vertex_b_x, self.vertex_c_x))
+        max_x = min(
+            canvas.width - 1, max(self.vertex_a_x, self.vertex_b_x, self.vertex_c_x)
+        )
         min_y = max(0, min(self.vertex_a_y, self.vertex_b_y, self.vertex_c_y))
-        max_y = min(39, max(self.vertex_a_y, self.vertex_b_y, self.vertex_c_y))
+        max_y = min(
+            canvas.height - 1, max(self.vertex_a_y, self.vertex_b_y, self.vertex_c_y)
+        )
 
         for current_y in range(min_y, max_y + 1):
             for current_x in range(min_x, max_x + 1):
@@ -82,7 +266,702 @@ class Triangle:
                 )
 
                 if is_inside:
-                    canvas[current_y][current_x] = "*"
+                    canvas.set_pixel(current_x, current_y, "*")
+
+    def _fill_area_scanline(self, canvas):
+        """Построчная заливка с тем же покрытием, что и у _fill_area.
+
+        Каждое из трёх векторных произведений линейно по x: slope * x + offset.
+        Для строки из неравенств сразу получается отрезок закрашенных x,
+        а при переходе к следующей строке offset меняется на постоянную
+        величину — считать произведения для каждой клетки не нужно.
+        """
+        ax, ay = self.vertex_a_x, self.vertex_a_y
+        bx, by = self.vertex_b_x, self.vertex_b_y
+        cx, cy = self.vertex_c_x, self.vertex_c_y
+
+        min_x = max(0, min(ax, bx, cx))
+        max_x = min(canvas.width - 1, max(ax, bx, cx))
+        min_y = max(0, min(ay, by, cy))
+        max_y = min(canvas.height - 1, max(ay, by, cy))
+
+        # (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1) для рёбер ab, bc, ca
+        edges = [
+            (y1 - y2, (x2 - x1) * (min_y - y1) + (y2 - y1) * x1, x2 - x1)
+            for (x1, y1), (x2, y2) in (
+                ((ax, ay), (bx, by)),
+                ((bx, by), (cx, cy)),
+                ((cx, cy), (ax, ay)),
+            )
+        ]
+        # Сумма трёх произведений равна удвоенной площади со знаком,
+        # поэтому у невырожденного треугольника подходит только один знак
+        area = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+        signs = (1,) if area > 0 else (-1,) if area < 0 else (1, -1)
+
+        for current_y in range(min_y, max_y + 1):
+            for sign in signs:
+                start_x, end_x = min_x, max_x
+                for slope, offset, _ in edges:
+                    start_x, end_x = _edge_span(
+                        sign * slope, sign * offset, start_x, end_x
+                    )
+                if start_x <= end_x:
+                    canvas.fill_span(current_y, start_x, end_x, "*")
+                    break
+            edges = [(slope, offset + step, step) for slope, offset, step in edges]
+
+
+def _edge_span(slope, offset, start_x, end_x):
+    """Сужает [start_x, end_x] до тех x, где slope * x + offset >= 0."""
+    if slope > 0:
+        start_x = max(start_x, -(offset // slope))  # ceil(-offset / slope)
+    elif slope < 0:
+        end_x = min(end_x, offset // -slope)  # floor(offset / -slope)
+    elif offset < 0:
+        return start_x, start_x - 1
+    return start_x, end_x
+
+
+def triangles_to_array(triangles):
+    """Собирает вершины объектов Triangle в массив формы (N, 3, 2)."""
+    return np.array(
+        [
+            [
+                [t.vertex_a_x, t.vertex_a_y],
+                [t.vertex_b_x, t.vertex_b_y],
+                [t.vertex_c_x, t.vertex_c_y],
+            ]
+            for t in triangles
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 3, 2)
+
+
+def fill_triangles(vertices, canvas, tile_size=32, char="*"):
+    """Заливает сразу много треугольников, покрытие как у Triangle._fill_area.
+
+    vertices — массив (N, 3, 2) целых координат. Поле обходится тайлами,
+    для каждого тайла берутся только треугольники, чья рамка его задевает,
+    и векторные произведения считаются для всех них разом через broadcasting.
+    Треугольники внутри тайла идут порциями, чтобы память была ограничена.
+    """
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 3, 2)
+    pixels = np.frombuffer(canvas.pixels, dtype=np.uint8).reshape(
+        canvas.height, canvas.width
+    )
+    value = ord(char)
+
+    xs = vertices[:, :, 0]
+    ys = vertices[:, :, 1]
+    # Рамки треугольников, обрезанные по полю — как в _fill_area
+    min_x = np.maximum(0, xs.min(axis=1))
+    max_x = np.minimum(canvas.width - 1, xs.max(axis=1))
+    min_y = np.maximum(0, ys.min(axis=1))
+    max_y = np.minimum(canvas.height - 1, ys.max(axis=1))
+
+    # Рёбра ab, bc, ca: начало (x1, y1) и приращения (dx, dy), форма (N, 3)
+    starts = vertices
+    deltas = np.roll(vertices, -1, axis=1) - vertices
+
+    for tile_y in range(0, canvas.height, tile_size):
+        tile_end_y = min(tile_y + tile_size, canvas.height) - 1
+        for tile_x in range(0, canvas.width, tile_size):
+            tile_end_x = min(tile_x + tile_size, canvas.width) - 1
+            hits = np.flatnonzero(
+                (min_x <= tile_end_x)
+                & (max_x >= tile_x)
+                & (min_y <= tile_end_y)
+                & (max_y >= tile_y)
+                & (min_x <= max_x)
+                & (min_y <= max_y)
+            )
+            if hits.size == 0:
+                continue
+
+            grid_x = np.arange(tile_x, tile_end_x + 1)
+            grid_y = np.arange(tile_y, tile_end_y + 1)[:, None]
+            covered = np.zeros((grid_y.size, grid_x.size), dtype=bool)
+            portion = max(1, BATCH_CELL_LIMIT // covered.size)
+
+            for first in range(0, hits.size, portion):
+                batch = hits[first : first + portion]
+                # (k, 3, 1, 1) — чтобы растянуть на сетку тайла
+                x1 = starts[batch, :, 0, None, None]
+                y1 = starts[batch, :, 1, None, None]
+                dx = deltas[batch, :, 0, None, None]
+                dy = deltas[batch, :, 1, None, None]
+                cross = dx * (grid_y - y1) - dy * (grid_x - x1)
+
+                inside = (cross >= 0).all(axis=1) | (cross <= 0).all(axis=1)
+                inside &= (
+                    (grid_x >= min_x[batch, None, None])
+                    & (grid_x <= max_x[batch, None, None])
+                    & (grid_y >= min_y[batch, None, None])
+                    & (grid_y <= max_y[batch, None, None])
+                )
+                covered |= inside.any(axis=0)
+
+            pixels[tile_y : tile_end_y + 1, tile_x : tile_end_x + 1][covered] = value
+
+
+def benchmark_batch(count=1000, size=400, max_side=40, seed=1):
+    """Сравнивает пакетную заливку с циклом по объектам Triangle."""
+    rng = np.random.default_rng(seed)
+    corners = rng.integers(0, size, size=(count, 1, 2))
+    vertices = corners + rng.integers(-max_side, max_side, size=(count, 3, 2))
+    triangles = [Triangle(*map(int, v.ravel())) for v in vertices]
+
+    loop_canvas = Canvas(size, size)
+    start = time.perf_counter()
+    for triangle in triangles:
+        triangle._fill_area(loop_canvas)
+    loop_time = time.perf_counter() - start
+
+    batch_canvas = Canvas(size, size)
+    start = time.perf_counter()
+    fill_triangles(vertices, batch_canvas)
+    batch_time = time.perf_counter() - start
+
+    assert loop_canvas.pixels == batch_canvas.pixels
+    print(f"\n{count} треугольников на поле {size}x{size}:")
+    print(f" цикл по объектам: {loop_time * 1000:.1f} мс")
+    print(f" пакетно (NumPy): {batch_time * 1000:.1f} мс")
+
+
+def benchmark_fill(size=400, repeats=3):
+    """Сравнивает попиксельную и построчную заливку на поле size x size."""
+    triangle = Triangle(size // 2, 0, 0, size - 1, size - 1, size * 3 // 4)
+    reference = Canvas(size, size)
+    scanline = Canvas(size, size)
+    triangle._fill_area(reference)
+    triangle._fill_area_scanline(scanline)
+    assert reference.pixels == scanline.pixels
+
+    print(f"\nЗаливка треугольника на поле {size}x{size}:")
+    for name, method, canvas in (
+        ("попиксельно", triangle._fill_area, reference),
+        ("построчно", triangle._fill_area_scanline, scanline),
+    ):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            canvas.clear()
+            method(canvas)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f" {name}: {elapsed * 1000:.1f} мс")
+
+
+class _TileCanvas:
+    """Окно в общий кадр: тайл с началом координат в своём левом верхнем углу.
+
+    Поддерживает то, что нужно _draw_outline и _fill_area_scanline, и пишет
+    прямо в массив кадра без промежуточных буферов.
+    """
+
+    def __init__(self, frame, x0, y0, x1, y1):
+        self.tile = frame[y0:y1, x0:x1]
+        self.width = x1 - x0
+        self.height = y1 - y0
+
+    def set_pixel(self, x, y, char="*"):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.tile[y, x] = ord(char)
+
+    def fill_span(self, y, start_x, end_x, char="*"):
+        start_x = max(start_x, 0)
+        end_x = min(end_x, self.width - 1)
+        if 0 <= y < self.height and start_x <= end_x:
+            self.tile[y, start_x : end_x + 1] = ord(char)
+
+
+class _BitTileCanvas:
+    """Как _TileCanvas, но по биту на клетку (старший бит байта — левая клетка)."""
+
+    def __init__(self, rows, width):
+        self.rows = rows
+        self.width = width
+        self.height = rows.shape[0]
+
+    def set_pixel(self, x, y, char="*"):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.rows[y, x >> 3] |= 0x80 >> (x & 7)
+
+    def fill_span(self, y, start_x, end_x, char="*"):
+        start_x = max(start_x, 0)
+        end_x = min(end_x, self.width - 1)
+        if not (0 <= y < self.height and start_x <= end_x):
+            return
+        row = self.rows[y]
+        first_byte = start_x >> 3
+        last_byte = end_x >> 3
+        first_mask = 0xFF >> (start_x & 7)
+        last_mask = (0xFF << (7 - (end_x & 7))) & 0xFF
+        if first_byte == last_byte:
+            row[first_byte] |= first_mask & last_mask
+        else:
+            row[first_byte] |= first_mask
+            row[first_byte + 1 : last_byte] = 0xFF
+            row[last_byte] |= last_mask
+
+
+class MemmapCanvas:
+    """Поле в файле на диске для полей, которые не помещаются в память.
+
+    bits=8 — байт на клетку (0 — фон, иначе код символа), bits=1 — бит на
+    клетку. Файл создаётся разреженным, а рисование идёт полосами строк:
+    каждая полоса отображается через numpy.memmap, дописывается на диск
+    и закрывается, поэтому в памяти живут только затронутые страницы
+    одной полосы, сколько бы ни было само поле.
+    """
+
+    def __init__(self, path, width, height, bits=8, background="."):
+        if bits not in (1, 8):
+            raise ValueError("bits может быть только 1 или 8")
+        self.path = path
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self.background = background
+        self.row_bytes = width if bits == 8 else (width + 7) // 8
+        self.band_rows = max(1, MEMMAP_BAND_BYTES // self.row_bytes)
+        with open(path, "wb") as file:
+            file.truncate(self.row_bytes * height)
+
+    def _map_rows(self, start_y, end_y, mode="r+"):
+        return np.memmap(
+            self.path,
+            dtype=np.uint8,
+            mode=mode,
+            offset=start_y * self.row_bytes,
+            shape=(end_y - start_y, self.row_bytes),
+        )
+
+    def get_pixel(self, x, y):
+        value = self._map_rows(y, y + 1, mode="r")[0, x if self.bits == 8 else x >> 3]
+        if self.bits == 1:
+            return "*" if value & (0x80 >> (x & 7)) else self.background
+        return chr(value) if value else self.background
+
+    def draw_triangle(self, triangle, filled=True):
+        """Рисует контур Triangle (и заливку) полосами строк.
+
+        В каждой полосе вершины сдвигаются на её начало — Брезенхем с
+        отсечением и построчная заливка от этого не меняются.
+        """
+        xs = (triangle.vertex_a_x, triangle.vertex_b_x, triangle.vertex_c_x)
+        ys = (triangle.vertex_a_y, triangle.vertex_b_y, triangle.vertex_c_y)
+        top = max(0, min(ys))
+        bottom = min(self.height - 1, max(ys))
+        if top > bottom or max(xs) < 0 or min(xs) >= self.width:
+            return
+
+        for band_y in range(top, bottom + 1, self.band_rows):
+            band_end = min(band_y + self.band_rows, bottom + 1)
+            rows = self._map_rows(band_y, band_end)
+            if self.bits == 8:
+                band = _TileCanvas(rows, 0, 0, self.width, band_end - band_y)
+            else:
+                band = _BitTileCanvas(rows, self.width)
+
+            shifted = Triangle(
+                xs[0], ys[0] - band_y, xs[1], ys[1] - band_y, xs[2], ys[2] - band_y
+            )
+            shifted.draw_outline(band)
+            if filled:
+                shifted._fill_area_scanline(band)
+
+            rows.flush()
+            del band, rows
+
+
+def _ink_mask(canvas):
+    """Маска закрашенных клеток Canvas: всё, что не фон."""
+    pixels = np.frombuffer(canvas.pixels, dtype=np.uint8).reshape(
+        canvas.height, canvas.width
+    )
+    return pixels != ord(canvas.background)
+
+
+def export_pbm(canvas, path):
+    """Сохраняет Canvas в PBM (P4): бит на клетку, закрашенная клетка — чёрная."""
+    packed = np.packbits(_ink_mask(canvas), axis=1)
+    with open(path, "wb") as file:
+        file.write(f"P4\n{canvas.width} {canvas.height}\n".encode("ascii"))
+        file.write(packed)  # Массив пишется своим буфером, без копии в bytes
+
+
+def export_pgm(canvas, path):
+    """Сохраняет Canvas в PGM (P5): фон белый (255), закрашенное — чёрное (0)."""
+    pixels = np.frombuffer(canvas.pixels, dtype=np.uint8).reshape(
+        canvas.height, canvas.width
+    )
+    # Единственный массив размером с поле: маска фона как uint8 (0/1),
+    # умноженная на месте на 255
+    gray = (pixels == ord(canvas.background)).view(np.uint8)
+    gray *= 255
+    with open(path, "wb") as file:
+        file.write(f"P5\n{canvas.width} {canvas.height}\n255\n".encode("ascii"))
+        file.write(gray)
+
+
+def _iter_packed_bands(canvas):
+    """Полосы строк поля в формате PBM: по биту на клетку, строка до байта."""
+    if isinstance(canvas, MemmapCanvas):
+        for band_y in range(0, canvas.height, canvas.band_rows):
+            band_end = min(band_y + canvas.band_rows, canvas.height)
+            rows = canvas._map_rows(band_y, band_end, mode="r")
+            if canvas.bits == 1:
+                # Разметка битов совпадает с P4, строки пишутся как есть
+                yield rows
+            else:
+                yield np.packbits(rows != 0, axis=1)
+            del rows
+    else:
+        mask = _ink_mask(canvas)
+        band_rows = max(1, MEMMAP_BAND_BYTES // max(1, canvas.width))
+        for band_y in range(0, canvas.height, band_rows):
+            yield np.packbits(mask[band_y : band_y + band_rows], axis=1)
+
+
+def stream_pbm(canvas, path):
+    """Пишет PBM (P4) полосами строк — годится для MemmapCanvas любого размера."""
+    with open(path, "wb") as file:
+        file.write(f"P4\n{canvas.width} {canvas.height}\n".encode("ascii"))
+        file.writelines(_iter_packed_bands(canvas))
+
+
+def stream_pgm(canvas, path):
+    """Пишет PGM (P5) полосами строк — годится для MemmapCanvas любого размера."""
+    with open(path, "wb") as file:
+        file.write(f"P5\n{canvas.width} {canvas.height}\n255\n".encode("ascii"))
+        for packed in _iter_packed_bands(canvas):
+            gray = np.unpackbits(packed, axis=1, count=canvas.width)
+            gray -= 1  # На месте: закрашенное 1 -> 0, фон 0 -> 255
+            file.write(gray)
+
+
+def _peak_rss_mb():
+    """Пиковая память процесса в МБ или None, если платформа её не сообщает."""
+    try:
+        # VmHWM в Linux — пик текущего адресного пространства, exec его сбрасывает
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource  # Модуля нет в Windows
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss в macOS — в байтах, в Linux — в килобайтах
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _draw_memmap_triangles(path, size, bits, count):
+    """Рисует треугольники на поле в файле; возвращает пики памяти по шагам."""
+    canvas = MemmapCanvas(path, size, size, bits=bits)
+    peaks = [(0.0, _peak_rss_mb())]
+    for index in range(count):
+        start = time.perf_counter()
+        canvas.draw_triangle(
+            Triangle(
+                size // 2,
+                size * index // (count * 2),
+                size // (index + 4),
+                size - 1,
+                size - 1 - size // (index + 4),
+                size * 3 // 4,
+            )
+        )
+        peaks.append((time.perf_counter() - start, _peak_rss_mb()))
+    return peaks
+
+
+def measure_memmap_rss(size=100_000, bits=1, count=3):
+    """Показывает, что пиковая память не растёт при рисовании на огромном поле.
+
+    Пик считается за всю жизнь процесса, поэтому рисование идёт в свежем
+    процессе: иначе "до" включало бы память предыдущих замеров.
+    """
+
+    def megabytes(value):
+        return "н/д" if value is None else f"{value:.0f} МБ"
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "canvas.bin")
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            peaks = executor.submit(
+                _draw_memmap_triangles, path, size, bits, count
+            ).result()
+
+    print(f"\nПоле {size}x{size} на диске ({bits} бит на клетку):")
+    print(f" пиковая память до: {megabytes(peaks[0][1])}")
+    for index, (seconds, peak) in enumerate(peaks[1:], 1):
+        print(
+            f" треугольник {index}: {seconds:.1f} с, "
+            f"пиковая память {megabytes(peak)}"
+        )
+
+
+# Кадр в общей памяти, к которому подключён процесс-обработчик сцены
+_scene_memory = None
+
+
+def _attach_scene(name):
+    global _scene_memory
+    _scene_memory = shared_memory.SharedMemory(name=name)
+
+
+def _render_tile(task):
+    """Задача процесса: рисует в общий кадр все фигуры, попавшие в тайл."""
+    width, height, (x0, y0, x1, y1), triangles, points, filled = task
+    frame = np.ndarray((height, width), dtype=np.uint8, buffer=_scene_memory.buf)
+    tile = _TileCanvas(frame, x0, y0, x1, y1)
+
+    for vertices in triangles:
+        # Сдвиг всех вершин на начало тайла не меняет ни пикселей Брезенхема,
+        # ни векторных произведений, поэтому результат совпадает с целым полем
+        ax, ay, bx, by, cx, cy = vertices
+        triangle = Triangle(ax - x0, ay - y0, bx - x0, by - y0, cx - x0, cy - y0)
+        triangle.draw_outline(tile)
+        if filled:
+            triangle._fill_area_scanline(tile)
+
+    for x, y in points:
+        tile.set_pixel(x - x0, y - y0, "*")
+
+    del frame, tile
+    return x0, y0
+
+
+class SceneRenderer:
+    """Рисует сцену из треугольников и точек (например, Figure) по тайлам.
+
+    Поле делится на тайлы tile_size x tile_size, фигуры раскладываются по
+    тайлам по своим рамкам, и тайлы рисуются в пуле процессов прямо в кадр
+    в multiprocessing.shared_memory. Тайлы не пересекаются, поэтому
+    результат не зависит от числа процессов и порядка задач. Кадр
+    возвращается как Canvas поверх общей памяти — без копирования.
+    """
+
+    def __init__(self, width, height, workers=1, tile_size=256):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self._memory = shared_memory.SharedMemory(create=True, size=width * height)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach_scene,
+            initargs=(self._memory.name,),
+        )
+        self.canvas = Canvas(width, height, pixels=self._memory.buf)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown()
+        self.canvas.pixels.release()
+        self._memory.close()
+        self._memory.unlink()
+
+    def _tiles(self):
+        for y0 in range(0, self.height, self.tile_size):
+            for x0 in range(0, self.width, self.tile_size):
+                y1 = min(y0 + self.tile_size, self.height)
+                x1 = min(x0 + self.tile_size, self.width)
+                yield x0, y0, x1, y1
+
+    def render(self, shapes, filled=True):
+        """Рисует фигуры: Triangle — контур (и заливку), объект с x/y — точку."""
+        triangles = []
+        points = []
+        for shape in shapes:
+            if isinstance(shape, Triangle):
+                triangles.append(
+                    (
+                        shape.vertex_a_x,
+                        shape.vertex_a_y,
+                        shape.vertex_b_x,
+                        shape.vertex_b_y,
+                        shape.vertex_c_x,
+                        shape.vertex_c_y,
+                    )
+                )
+            else:
+                points.append((shape.x, shape.y))
+
+        # Рамки фигур: контур и заливка не выходят за рамку вершин
+        bounds = [
+            (min(t[0::2]), min(t[1::2]), max(t[0::2]), max(t[1::2])) for t in triangles
+        ]
+
+        tasks = []
+        for x0, y0, x1, y1 in self._tiles():
+            tile_triangles = [
+                triangle
+                for triangle, (left, top, right, bottom) in zip(triangles, bounds)
+                if left < x1 and right >= x0 and top < y1 and bottom >= y0
+            ]
+            tile_points = [(x, y) for x, y in points if x0 <= x < x1 and y0 <= y < y1]
+            if tile_triangles or tile_points:
+                tasks.append(
+                    (
+                        self.width,
+                        self.height,
+                        (x0, y0, x1, y1),
+                        tile_triangles,
+                        tile_points,
+                        filled,
+                    )
+                )
+
+        self.canvas.clear()
+        for _ in self._executor.map(_render_tile, tasks):
+            pass
+        return self.canvas
+
+
+def benchmark_scene(size=4000, count=400, worker_counts=(1, 2, 4, 8), seed=1):
+    """Время рисования большой сцены при разном числе процессов."""
+    rng = np.random.default_rng(seed)
+    corners = rng.integers(0, size, size=(count, 1, 2))
+    vertices = corners + rng.integers(-size // 10, size // 10, size=(count, 3, 2))
+    shapes = [Triangle(*map(int, v.ravel())) for v in vertices]
+
+    print(f"\nСцена {size}x{size}, {count} треугольников:")
+    reference = None
+    for workers in worker_counts:
+        with SceneRenderer(size, size, workers=workers) as renderer:
+            renderer.render(shapes[:1])  # Прогрев: запуск процессов пула
+            start = time.perf_counter()
+            canvas = renderer.render(shapes)
+            elapsed = time.perf_counter() - start
+            frame = bytes(canvas.pixels)
+
+        if reference is None:
+            reference = frame
+        assert frame == reference, "результат зависит от числа процессов"
+        print(f" процессов {workers}: {elapsed * 1000:.0f} мс")
+
+
+def grid_to_ppm(canvas, cell_size=1, region=None):
+    """Переводит поле (или прямоугольник region) в картинку PPM (P6).
+
+    region — (x0, y0, x1, y1), правая и нижняя границы не включаются.
+    Каждая клетка становится квадратом cell_size x cell_size пикселей,
+    при крупных клетках по их краю рисуется чёрная сетка.
+    """
+    pixels = np.frombuffer(canvas.pixels, dtype=np.uint8).reshape(
+        canvas.height, canvas.width
+    )
+    if region is not None:
+        x0, y0, x1, y1 = region
+        pixels = pixels[y0:y1, x0:x1]
+
+    rgb = PALETTE[pixels]
+    if cell_size > 1:
+        rgb = rgb.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+        if cell_size >= 4:
+            rgb[cell_size - 1 :: cell_size, :] = 0
+            rgb[:, cell_size - 1 :: cell_size] = 0
+
+    header = f"P6 {rgb.shape[1]} {rgb.shape[0]} 255\n".encode("ascii")
+    return header + rgb.tobytes()
+
+
+class GridView:
+    """Показывает Canvas одной картинкой tk.PhotoImage.
+
+    Вместо прямоугольника на каждую клетку — одна картинка. refresh сравнивает
+    поле с последним показанным кадром и заново заливает в картинку только
+    прямоугольник, в котором клетки изменились.
+    """
+
+    def __init__(self, root, canvas, cell_size=15):
+        self.canvas = canvas
+        self.cell_size = cell_size
+        width = canvas.width * cell_size
+        height = canvas.height * cell_size
+
+        self.image = tk.PhotoImage(width=width, height=height)
+        self.widget = tk.Canvas(
+            root, width=width, height=height, bg="#1e1e1e", highlightthickness=0
+        )
+        self.widget.create_image(0, 0, image=self.image, anchor="nw")
+        self._shown = None
+        self.refresh()
+
+    def refresh(self):
+        """Обновляет картинку и возвращает перерисованный прямоугольник (или None)."""
+        current = np.frombuffer(self.canvas.pixels, dtype=np.uint8).reshape(
+            self.canvas.height, self.canvas.width
+        )
+        if self._shown is None:
+            region = (0, 0, self.canvas.width, self.canvas.height)
+            self._shown = current.copy()
+        else:
+            changed = current != self._shown
+            rows = np.flatnonzero(changed.any(axis=1))
+            if rows.size == 0:
+                return None
+            columns = np.flatnonzero(changed.any(axis=0))
+            region = (columns[0], rows[0], columns[-1] + 1, rows[-1] + 1)
+
+        x0, y0, x1, y1 = (int(value) for value in region)
+        self._shown[y0:y1, x0:x1] = current[y0:y1, x0:x1]
+        data = grid_to_ppm(self.canvas, self.cell_size, (x0, y0, x1, y1))
+        self.image.tk.call(
+            self.image.name,
+            "put",
+            data,
+            "-format",
+            "ppm",
+            "-to",
+            x0 * self.cell_size,
+            y0 * self.cell_size,
+        )
+        return x0, y0, x1, y1
+
+
+def measure_frame_times(sizes=(40, 200, 1000), frames=20, cell_size=1):
+    """Замеряет время первого кадра и кадра после сдвига треугольника."""
+    root = tk.Tk()
+    root.withdraw()
+    print("\nВремя кадра GridView:")
+    for size in sizes:
+        canvas = Canvas(size, size)
+        triangle = Triangle(
+            size // 2, size // 8, size // 8, size * 3 // 4, size * 7 // 8, size * 3 // 4
+        )
+        triangle.get_grid(canvas)
+
+        start = time.perf_counter()
+        view = GridView(root, canvas, cell_size)
+        root.update_idletasks()
+        first_frame = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for frame in range(frames):
+            triangle.move(1 if frame % 2 == 0 else -1, 0)
+            triangle.get_grid(canvas)
+            view.refresh()
+            root.update_idletasks()
+        move_frame = (time.perf_counter() - start) / frames
+
+        print(
+            f" {size}x{size}: первый кадр {first_frame * 1000:.1f} мс, "
+            f"кадр после сдвига {move_frame * 1000:.1f} мс"
+        )
+        view.widget.destroy()
+    root.destroy()
 
 
 def render_gui():
@@ -92,34 +971,33 @@ def render_gui():
 
     cell_size = 15
     grid_size = 40
-    canvas_size = grid_size * cell_size
-
-    tk_canvas = tk.Canvas(
-        root, width=canvas_size, height=canvas_size, bg="#1e1e1e", highlightthickness=0
-    )
-    tk_canvas.pack(padx=20, pady=20)
 
     triangle = Triangle(20, 5, 5, 30, 35, 30)
-    grid = triangle.get_grid()
-
-    for y in range(grid_size):
-        for x in range(grid_size):
-            x1 = x * cell_size
-            y1 = y * cell_size
-            x2 = x1 + cell_size
-            y2 = y1 + cell_size
-
-            if grid[y][x] == "*":
-                tk_canvas.create_rectangle(
-                    x1, y1, x2, y2, fill="#2ccdd2", outline="#000000"
-                )
-            else:
-                tk_canvas.create_rectangle(
-                    x1, y1, x2, y2, fill="#1e1e1e", outline="#000000"
-                )
+    grid = Canvas(grid_size, grid_size)
+    triangle.get_grid(grid)
+
+    view = GridView(root, grid, cell_size)
+    view.widget.pack(padx=20, pady=20)
+
+    # Стрелки двигают треугольник, перерисовывается только изменённая область
+    def move(dx, dy):
+        triangle.move(dx, dy)
+        triangle.get_grid(grid)
+        view.refresh()
+
+    root.bind("<Left>", lambda event: move(-1, 0))
+    root.bind("<Right>", lambda event: move(1, 0))
+    root.bind("<Up>", lambda event: move(0, -1))
+    root.bind("<Down>", lambda event: move(0, 1))
 
     root.mainloop()
 
 
-if __name__ == "__main__":
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    benchmark_fill()
+    benchmark_batch()
+    benchmark_scene()
+    measure_memmap_rss(size=20_000)
+    measure_frame_times()
+elif __name__ == "__main__":
     render_gui()
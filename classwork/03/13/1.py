@@ -1,3 +1,9 @@
+import random
+import sys
+import time
+from array import array
+
+
 class Product:
     def __init__(self, name, manufacturer, price):
         self._name = name
@@ -74,8 +80,151 @@ class Food(Product):
         return f"{super().__str__()}, Expires: {self.expiration_date}"
 
 
+class Catalog:
+    """Каталог товаров с триграммным индексом по названиям.
+
+    search дает тот же результат, что перебор products с matches, и в том же
+    порядке, но по названию ищет через индекс: для каждой триграммы
+    нормализованного (lower) названия хранится список id товаров.
+    """
+
+    # Когда следующий список длиннее кандидатов во столько раз,
+    # дешевле проверить кандидатов подстрокой, чем пересекать дальше
+    INTERSECT_RATIO = 8
+
+    def __init__(self, products=()):
+        self._products = {}  # id -> товар, в порядке добавления
+        self._names = {}  # id -> название в нижнем регистре
+        self._ids = {}  # товар -> id (по объекту)
+        self._postings = {}  # триграмма -> array id по возрастанию
+        self._next_id = 0
+        self._stale = 0  # Удаленные id, еще лежащие в списках
+        for product in products:
+            self.add(product)
+
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, product):
+        if product in self._ids:
+            raise ValueError("Product is already in the catalog")
+        product_id = self._next_id
+        self._next_id += 1
+        name = product.name.lower()
+        self._products[product_id] = product
+        self._names[product_id] = name
+        self._ids[product] = product_id
+        postings = self._postings
+        for trigram in self._trigrams(name):
+            posting = postings.get(trigram)
+            if posting is None:
+                posting = postings[trigram] = array("q")
+            posting.append(product_id)  # id растут, список остается отсортированным
+
+    def remove(self, product):
+        """Удаляет товар. Из списков индекса id вычищаются пачкой позже."""
+        product_id = self._ids.pop(product, None)
+        if product_id is None:
+            raise ValueError("Product is not in the catalog")
+        del self._products[product_id]
+        del self._names[product_id]
+        self._stale += 1
+        if self._stale > len(self._products):
+            self._compact()
+
+    def _compact(self):
+        """Пересобирает списки индекса без удаленных id."""
+        live = self._names
+        postings = {}
+        for trigram, posting in self._postings.items():
+            kept = array("q", [i for i in posting if i in live])
+            if kept:
+                postings[trigram] = kept
+        self._postings = postings
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._products)
+
+    def __iter__(self):
+        return iter(self._products.values())
+
+    def __contains__(self, product):
+        return product in self._ids
+
+    def _name_ids(self, search_name):
+        """id товаров, в названии которых есть search_name (без учета регистра)."""
+        query = search_name.lower()
+        names = self._names
+        if len(query) < 3:
+            # Для коротких запросов триграмм нет — проверяем все названия,
+            # но уже приведенные к нижнему регистру
+            return [i for i, name in names.items() if query in name]
 
-if __name__ == "__main__":
+        postings = []
+        for trigram in self._trigrams(query):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if len(posting) > self.INTERSECT_RATIO * len(candidates):
+                break
+            candidates.intersection_update(posting)
+        # Проверка нужна и для ложных совпадений по триграммам, и для удаленных id
+        return sorted(i for i in candidates if query in names.get(i, ""))
+
+    def search(self, search_name=None, search_price=None):
+        """Товары, для которых matches(search_name, search_price) истинно."""
+        name_ids = self._name_ids(search_name) if search_name else []
+        if search_price is None:
+            return [self._products[i] for i in name_ids]
+        # Цена меняется через сеттер в обход каталога, поэтому она не индексируется
+        name_ids = set(name_ids)
+        return [
+            product
+            for i, product in self._products.items()
+            if i in name_ids or product.price == search_price
+        ]
+
+
+def benchmark_search(count=5_000_000, seed=1):
+    """Сравнивает поиск по индексу Catalog с перебором matches."""
+    rng = random.Random(seed)
+    words = ["Phone", "Smart", "Ultra", "Milk", "Jeans", "Nike", "Sony", "Пальто",
+             "Молоко", "Headphones", "Laptop", "Pro", "Max", "Mini", "Зимний", "Кефир"]
+    start = time.perf_counter()
+    products = [
+        Product(
+            f"{rng.choice(words)} {rng.choice(words)} {rng.randrange(100_000)}", "Brand", i % 1000
+        )
+        for i in range(count)
+    ]
+    print(f"Товары: {count}, созданы за {time.perf_counter() - start:.1f} с")
+
+    start = time.perf_counter()
+    catalog = Catalog(products)
+    print(f"Индекс построен за {time.perf_counter() - start:.1f} с")
+
+    for query in ("iphone", "ultra milk 4242", "ИЙ КЕ", "99999", "Pro", "x"):
+        start = time.perf_counter()
+        found = catalog.search(search_name=query)
+        indexed = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = [p for p in products if p.matches(search_name=query)]
+        scanned = time.perf_counter() - start
+        assert found == expected, query
+        print(f" {query!r}: найдено {len(found)}, индекс {indexed * 1000:.1f} мс, "
+              f"перебор {scanned * 1000:.0f} мс")
+
+
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    benchmark_search()
+elif __name__ == "__main__":
     products = [
         Electronics("iPhone 15", "Apple", 100000, "Smartphone"),
         Clothing("T-shirt", "Nike", 3000, "L"),
@@ -101,3 +250,9 @@ if __name__ == "__main__":
     for p in products:
         if p.matches(search_price=target_price):
             print(p)
+
+    # Тот же поиск через каталог с триграммным индексом
+    catalog = Catalog(products)
+    print(f"\n--- Catalog Search (Name: '{target_name}' or Price: '{target_price}') ---")
+    for p in catalog.search(search_name=target_name, search_price=target_price):
+        print(p)
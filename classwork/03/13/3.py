@@ -1,18 +1,107 @@
+import contextlib
+import csv
+import io
+import json
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
+from functools import lru_cache
+
+# Как часто загрузчик реестра печатает прогресс (в записях)
+LOAD_PROGRESS_EVERY = 100_000
+
+# Схема хранилища реестра. Даты хранятся строками yyyy-mm-dd, чтобы их можно
+# было сравнивать и индексировать как текст. registry_workers — порядок
+# Registry.workers; рабочие, известные только по домам или штату, в него не входят.
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    qualification TEXT NOT NULL,
+    company_id INTEGER REFERENCES companies (id)
+);
+CREATE TABLE IF NOT EXISTS registry_workers (
+    position INTEGER PRIMARY KEY,
+    worker_id INTEGER NOT NULL REFERENCES workers (id)
+);
+CREATE TABLE IF NOT EXISTS houses (
+    id INTEGER PRIMARY KEY,
+    address TEXT NOT NULL,
+    floors INTEGER NOT NULL,
+    entrances INTEGER NOT NULL,
+    district TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS house_workers (
+    house_id INTEGER NOT NULL REFERENCES houses (id),
+    position INTEGER NOT NULL,
+    worker_id INTEGER NOT NULL REFERENCES workers (id),
+    PRIMARY KEY (house_id, position)
+);
+CREATE INDEX IF NOT EXISTS house_workers_worker ON house_workers (worker_id, house_id);
+CREATE INDEX IF NOT EXISTS houses_dates ON houses (start_date, end_date);
+CREATE INDEX IF NOT EXISTS workers_company ON workers (company_id);
+"""
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_date(text):
+    """Разбирает дату вида dd.mm.yyyy.
+
+    Строгий формат разбирается срезами без strptime, остальное (например,
+    "1.6.2022") уходит в strptime. Даты в реестре сильно повторяются,
+    поэтому результаты кэшируются — datetime неизменяем, его можно делить.
+    """
+    if (
+        len(text) == 10
+        and text[2] == "."
+        and text[5] == "."
+        and text.isascii()
+        and text[:2].isdigit()
+        and text[3:5].isdigit()
+        and text[6:].isdigit()
+    ):
+        return datetime(int(text[6:]), int(text[3:5]), int(text[:2]))
+    return datetime.strptime(text, "%d.%m.%Y")
 
 
 class Company:
     """Класс для представления строительной компании."""
 
+    __slots__ = ("employees", "name")
+
     def __init__(self, name):
         self.name = name
-        self.employees = []  # Список сотрудников компании
+        # Штат компании: dict рабочий -> None. Ключи сравниваются по объекту,
+        # порядок найма сохраняется, добавление и удаление — O(1)
+        self.employees = {}
 
     def add_employee(self, worker):
-        """Добавляет рабочего в штат компании и связывает рабочего с этой компанией."""
-        self.employees.append(worker)
+        """Добавляет рабочего в штат компании и связывает рабочего с этой компанией.
+
+        Если рабочий числился в другой компании, он оттуда переводится.
+        """
+        previous = worker.company
+        if previous is not None and previous is not self:
+            previous.employees.pop(worker, None)
+        self.employees[worker] = None
         worker.company = self
 
+    def remove_employee(self, worker):
+        """Увольняет рабочего: убирает из штата, рабочий становится самозанятым."""
+        del self.employees[worker]
+        if worker.company is self:
+            worker.company = None
+
     def __str__(self):
         return f"Компания '{self.name}' (сотрудников: {len(self.employees)})"
 
@@ -20,14 +109,23 @@ class Company:
 class Worker:
     """Класс для описания рабочего."""
 
+    __slots__ = ("company", "name", "qualification")
+
     def __init__(self, name, qualification, company=None):
         self.name = name
         self.qualification = qualification
-        self.company = company
+        self.company = None
         # Если при создании указана компания, автоматически записываем в неё рабочего
         if company:
             company.add_employee(self)
 
+    def transfer_to(self, company):
+        """Переводит рабочего в другую компанию (None — в самозанятые)."""
+        if company is not None:
+            company.add_employee(self)
+        elif self.company is not None:
+            self.company.remove_employee(self)
+
     def __str__(self):
         # Если компания не задана, выводим 'Самозанятый'
         comp_name = self.company.name if self.company else "Самозанятый"
@@ -37,16 +135,19 @@ class Worker:
 class House:
     """Класс для описания строительного объекта (дома)."""
 
+    __slots__ = ("address", "district", "end_date", "entrances", "floors", "start_date", "workers")
+
     def __init__(self, address, floors, entrances, district, workers, start_date_str, end_date_str):
         self.address = address
         self.floors = floors
         self.entrances = entrances
         self.district = district
-        self.workers = workers  # Список рабочих, закрепленных за объектом
+        # Рабочие объекта: dict рабочий -> None (повторы схлопываются, порядок сохраняется)
+        self.workers = dict.fromkeys(workers)
 
         # Преобразуем строки с датами в объекты datetime для удобного сравнения
-        self.start_date = datetime.strptime(start_date_str, "%d.%m.%Y")
-        self.end_date = datetime.strptime(end_date_str, "%d.%m.%Y")
+        self.start_date = parse_date(start_date_str)
+        self.end_date = parse_date(end_date_str)
 
     def is_worker_busy_in_year(self, worker, year):
         """Проверяет, работал ли конкретный рабочий на этом объекте в указанном году."""
@@ -71,31 +172,680 @@ class Registry:
     def __init__(self):
         self.houses = []
         self.workers = []
+        # Составы домов в реестре (по индексу дома): dict рабочий -> None,
+        # как House.workers, чтобы правка состава была O(1). Индекс
+        # по годам и заметающая прямая строятся из них, поэтому оба отчета
+        # видят один и тот же состав — снятый с house.workers в add_house.
+        self._rosters = []
+        # Индекс занятости: рабочий -> {год -> индексы домов по возрастанию}.
+        # Дом попадает в каждый год своего срока, поэтому отчет за год
+        # не перебирает все дома.
+        self._houses_by_year = {}
+        # Дом -> его индексы в self.houses (один дом можно добавить дважды)
+        self._house_indexes = {}
+        # Кэш отчетов employment_report по годам; сбрасывается при изменениях
+        self._year_reports = {}
+        # Занятость рабочего: отсортированные непересекающиеся отрезки
+        # [начало, конец] — два параллельных списка для двоичного поиска
+        self._busy_intervals = {}
+        # Вторичный индекс по квалификации (рабочие реестра без повторов)
+        self._workers_by_qualification = {}
+        # Позиция рабочего в реестре (первое добавление) — для порядка выдачи
+        self._worker_positions = {}
 
     def add_house(self, house):
+        index = len(self.houses)
         self.houses.append(house)
+        self._house_indexes.setdefault(house, []).append(index)
+        self._year_reports.clear()
+        years = range(house.start_date.year, house.end_date.year + 1)
+        # dict.fromkeys убирает повторы рабочего в одном доме, сохраняя порядок
+        roster = dict.fromkeys(house.workers)
+        self._rosters.append(roster)
+        for worker in roster:
+            by_year = self._houses_by_year.setdefault(worker, {})
+            for year in years:
+                by_year.setdefault(year, []).append(index)
+            self._add_busy_interval(worker, house.start_date, house.end_date)
+
+    def assign_worker(self, house, worker):
+        """Закрепляет рабочего за домом реестра, обновляя индексы и сбрасывая кэш.
+
+        Состав зарегистрированного дома меняется только так: прямое изменение
+        house.workers реестр не увидит.
+        """
+        indexes = self._house_indexes.get(house)
+        if indexes is None:
+            raise ValueError("Дом не добавлен в реестр")
+        house.workers[worker] = None
+        years = range(house.start_date.year, house.end_date.year + 1)
+        by_year = self._houses_by_year.setdefault(worker, {})
+        for index in indexes:
+            roster = self._rosters[index]
+            if worker in roster:
+                continue
+            roster[worker] = None
+            for year in years:
+                insort(by_year.setdefault(year, []), index)
+            self._add_busy_interval(worker, house.start_date, house.end_date)
+        self._year_reports.clear()
+
+    def unassign_worker(self, house, worker):
+        """Снимает рабочего с дома реестра, обновляя индексы и сбрасывая кэш."""
+        indexes = self._house_indexes.get(house)
+        if indexes is None:
+            raise ValueError("Дом не добавлен в реестр")
+        house.workers.pop(worker, None)
+        by_year = self._houses_by_year.get(worker, {})
+        for index in indexes:
+            roster = self._rosters[index]
+            if worker not in roster:
+                continue
+            del roster[worker]
+            for year in range(house.start_date.year, house.end_date.year + 1):
+                by_year[year].remove(index)
+                if not by_year[year]:
+                    del by_year[year]
+        # Слитые отрезки не разделить обратно — собираем занятость заново
+        self._busy_intervals.pop(worker, None)
+        for index in sorted({i for year_indexes in by_year.values() for i in year_indexes}):
+            other = self.houses[index]
+            self._add_busy_interval(worker, other.start_date, other.end_date)
+        self._year_reports.clear()
 
     def add_worker(self, worker):
         self.workers.append(worker)
+        self._year_reports.clear()
+        self._houses_by_year.setdefault(worker, {})
+        self._workers_by_qualification.setdefault(worker.qualification, {})[worker] = None
+        self._worker_positions.setdefault(worker, len(self.workers) - 1)
+
+    def _add_busy_interval(self, worker, start, end):
+        """Вставляет срок в список занятости рабочего, сливая пересечения.
+
+        Срок с концом раньше начала (ошибка ввода) занятости не добавляет.
+        """
+        if end < start:
+            return
+        starts, ends = self._busy_intervals.setdefault(worker, ([], []))
+        first = bisect_left(starts, start)
+        if first > 0 and ends[first - 1] >= start:
+            first -= 1
+        last = first
+        while last < len(starts) and starts[last] <= end:
+            start = min(start, starts[last])
+            end = max(end, ends[last])
+            last += 1
+        starts[first:last] = [start]
+        ends[first:last] = [end]
+
+    def is_worker_free(self, worker, start, end):
+        """Свободен ли рабочий на всем отрезке [start, end] (включительно)."""
+        starts, ends = self._busy_intervals.get(worker, ((), ()))
+        # Отрезки не пересекаются, поэтому проверять нужно только последний,
+        # начавшийся не позже end: у всех предыдущих конец еще раньше
+        position = bisect_right(starts, end)
+        return position == 0 or ends[position - 1] < start
+
+    def available_workers(self, start, end, qualification=None, company=None):
+        """Рабочие реестра, свободные с start по end включительно.
+
+        start и end — datetime или строки dd.mm.yyyy. Фильтр по квалификации
+        идет через индекс реестра, по компании — через ее штат (Company.employees),
+        кандидаты берутся из меньшего набора. Порядок — как в реестре.
+        """
+        if isinstance(start, str):
+            start = parse_date(start)
+        if isinstance(end, str):
+            end = parse_date(end)
+
+        positions = self._worker_positions
+        if qualification is not None:
+            candidates = self._workers_by_qualification.get(qualification, {})
+            if company is not None and len(company.employees) < len(candidates):
+                candidates = company.employees
+        elif company is not None:
+            candidates = company.employees
+        else:
+            candidates = dict.fromkeys(self.workers)
+
+        free = [
+            worker
+            for worker in dict.fromkeys(candidates)
+            if worker in positions
+            and (qualification is None or worker.qualification == qualification)
+            and (company is None or worker.company is company)
+            and self.is_worker_free(worker, start, end)
+        ]
+        free.sort(key=positions.__getitem__)
+        return free
+
+    def load_csv(self, path, progress_every=LOAD_PROGRESS_EVERY):
+        """Загружает рабочих и дома из CSV за один проход.
+
+        Колонки: type (worker/house), id, name, qualification, company, address,
+        floors, entrances, district, workers, start_date, end_date. Лишние для
+        типа записи колонки остаются пустыми; workers — ссылки через ";".
+        """
+        with open(path, encoding="utf-8", newline="") as file:
+            return self._load_records(csv.DictReader(file), progress_every)
+
+    def load_jsonl(self, path, progress_every=LOAD_PROGRESS_EVERY):
+        """Загружает рабочих и дома из JSON Lines (по объекту на строку).
+
+        Поля те же, что у load_csv, но workers — список ссылок.
+        """
+        with open(path, encoding="utf-8") as file:
+            records = (json.loads(line) for line in file if line.strip())
+            return self._load_records(records, progress_every)
+
+    def _load_records(self, records, progress_every):
+        """Строит объекты Worker/House из потока записей и добавляет в реестр.
+
+        Ссылки на рабочих разрешаются словарем по id и по имени: сначала
+        известны рабочие реестра, затем добавляются загруженные. Компании
+        создаются по имени один раз. Возвращает количество записей.
+        """
+        workers_by_ref = {worker.name: worker for worker in self.workers}
+        companies = {}
+        for worker in self.workers:
+            if worker.company:
+                companies.setdefault(worker.company.name, worker.company)
+
+        start = time.perf_counter()
+        count = 0
+        for count, record in enumerate(records, 1):
+            kind = record.get("type") or "house"
+            if kind == "worker":
+                company_name = record.get("company")
+                company = None
+                if company_name:
+                    company = companies.get(company_name)
+                    if company is None:
+                        company = companies[company_name] = Company(company_name)
+                worker = Worker(record["name"], record["qualification"], company)
+                self.add_worker(worker)
+                workers_by_ref[worker.name] = worker
+                if record.get("id"):
+                    workers_by_ref[str(record["id"])] = worker
+            elif kind == "house":
+                refs = record.get("workers") or []
+                if isinstance(refs, str):
+                    refs = [ref for ref in refs.split(";") if ref]
+                try:
+                    workers = [workers_by_ref[str(ref)] for ref in refs]
+                except KeyError as error:
+                    raise ValueError(
+                        f"Запись {count}: неизвестный рабочий {error.args[0]!r}"
+                    ) from None
+                self.add_house(
+                    House(
+                        record["address"],
+                        int(record["floors"]),
+                        int(record["entrances"]),
+                        record["district"],
+                        workers,
+                        record["start_date"],
+                        record["end_date"],
+                    )
+                )
+            else:
+                raise ValueError(f"Запись {count}: неизвестный тип {kind!r}")
+
+            if progress_every and count % progress_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"Загружено {count} записей ({count / elapsed:.0f} в секунду)")
+
+        return count
+
+    def employment_report(self, first_year, last_year):
+        """Отчет о занятости за все годы диапазона — данными, без печати.
+
+        Возвращает {год: ((рабочий, (дома...)), ...)} с рабочими в порядке
+        реестра и домами в порядке добавления, как в show_worker_statistics.
+        Годы, которых нет в кэше, считаются одним проходом заметающей прямой.
+        Отчеты за год — кортежи из кэша, поэтому изменить кэш снаружи нельзя.
+        """
+        years = range(first_year, last_year + 1)
+        missing = [year for year in years if year not in self._year_reports]
+        if missing:
+            self._sweep_years(missing[0], missing[-1])
+        return {year: self._year_reports[year] for year in years}
+
+    def _sweep_years(self, first_year, last_year):
+        """Заметающая прямая по годам: события начала и конца сроков домов.
+
+        Дом активен с года начала по год окончания включительно, поэтому
+        событие снятия приходится на год после окончания. События
+        сортируются один раз, затем для каждого года обходятся только
+        активные дома.
+        """
+        events = []
+        for index, house in enumerate(self.houses):
+            if house.end_date.year < house.start_date.year:
+                continue  # Срок задан наоборот — ни в одном году дом не активен
+            events.append((house.start_date.year, 1, index))
+            events.append((house.end_date.year + 1, -1, index))
+        events.sort()
+
+        active = {}
+        position = 0
+        for year in range(first_year, last_year + 1):
+            while position < len(events) and events[position][0] <= year:
+                _, kind, index = events[position]
+                if kind == 1:
+                    active[index] = self.houses[index]
+                else:
+                    active.pop(index, None)
+                position += 1
+
+            projects = {}
+            for index in sorted(active):
+                house = active[index]
+                for worker in self._rosters[index]:
+                    projects.setdefault(worker, []).append(house)
+
+            self._year_reports[year] = tuple(
+                (worker, tuple(projects.get(worker, ()))) for worker in self.workers
+            )
+
+    def projects_in_year(self, worker, year):
+        """Дома, где рабочий был занят в указанном году (через индекс)."""
+        houses = self.houses
+        return [houses[index] for index in self._houses_by_year.get(worker, {}).get(year, ())]
 
     def show_worker_statistics(self, year):
         """Формирует и печатает отчет о занятости всех рабочих за конкретный год."""
         print(f"\n--- Отчет по занятости рабочих за {year} год ---")
+        for worker in self.workers:
+            self._print_worker_projects(worker, self.projects_in_year(worker, year))
+
+    def show_worker_statistics_reference(self, year):
+        """Исходный перебор рабочие x дома — эталон для проверки и замеров."""
+        print(f"\n--- Отчет по занятости рабочих за {year} год ---")
         for worker in self.workers:
             # Ищем все дома, где этот рабочий был занят в указанном году
             projects = [h for h in self.houses if h.is_worker_busy_in_year(worker, year)]
-            count = len(projects)
+            self._print_worker_projects(worker, projects)
 
-            if count > 0:
-                print(f" {worker.name}: задействован в {count} проектах одновременно.")
-                for p in projects:
-                    print(f"   - {p}")
-            else:
-                print(f" {worker.name}: в этом году проектов не было.")
+    @staticmethod
+    def _print_worker_projects(worker, projects):
+        count = len(projects)
+
+        if count > 0:
+            print(f" {worker.name}: задействован в {count} проектах одновременно.")
+            for p in projects:
+                print(f"   - {p}")
+        else:
+            print(f" {worker.name}: в этом году проектов не было.")
+
+
+class RegistryStore:
+    """Хранилище реестра в SQLite: компании, рабочие, дома и их связи.
+
+    Отчеты по годам считаются запросами к базе, а объекты Company/Worker/House
+    создаются лениво — только те, что попали в отчет, — и кэшируются по id,
+    так что один и тот же рабочий всегда остается одним объектом.
+    """
+
+    # Сколько id подставлять в один запрос WHERE id IN (...)
+    ID_BATCH = 500
+
+    def __init__(self, path=":memory:"):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(STORE_SCHEMA)
+        self._companies = {}
+        self._workers = {}
+        self._houses = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def save_registry(self, registry):
+        """Сохраняет реестр целиком, заменяя прежнее содержимое базы.
+
+        Все вставки идут через executemany в одной транзакции. Рабочие
+        собираются из реестра, составов домов и штатов их компаний.
+        """
+        worker_ids = {}
+        for worker in registry.workers:
+            worker_ids.setdefault(worker, len(worker_ids) + 1)
+        for house in registry.houses:
+            for worker in house.workers:
+                worker_ids.setdefault(worker, len(worker_ids) + 1)
+        company_ids = {}
+        for worker in list(worker_ids):
+            if worker.company is not None:
+                company_ids.setdefault(worker.company, len(company_ids) + 1)
+        for company in list(company_ids):
+            for worker in company.employees:
+                worker_ids.setdefault(worker, len(worker_ids) + 1)
+                if worker.company is not None:
+                    company_ids.setdefault(worker.company, len(company_ids) + 1)
+
+        with self.connection:
+            for table in ("house_workers", "houses", "registry_workers", "workers", "companies"):
+                self.connection.execute(f"DELETE FROM {table}")
+            self.connection.executemany(
+                "INSERT INTO companies (id, name) VALUES (?, ?)",
+                ((company_id, company.name) for company, company_id in company_ids.items()),
+            )
+            self.connection.executemany(
+                "INSERT INTO workers (id, name, qualification, company_id) VALUES (?, ?, ?, ?)",
+                (
+                    (worker_id, worker.name, worker.qualification, company_ids.get(worker.company))
+                    for worker, worker_id in worker_ids.items()
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO registry_workers (position, worker_id) VALUES (?, ?)",
+                ((position, worker_ids[worker]) for position, worker in enumerate(registry.workers)),
+            )
+            self.connection.executemany(
+                "INSERT INTO houses (id, address, floors, entrances, district, start_date, end_date)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        house_id,
+                        house.address,
+                        house.floors,
+                        house.entrances,
+                        house.district,
+                        house.start_date.date().isoformat(),
+                        house.end_date.date().isoformat(),
+                    )
+                    for house_id, house in enumerate(registry.houses, 1)
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO house_workers (house_id, position, worker_id) VALUES (?, ?, ?)",
+                (
+                    (house_id, position, worker_ids[worker])
+                    for house_id, house in enumerate(registry.houses, 1)
+                    for position, worker in enumerate(house.workers)
+                ),
+            )
+
+        self._companies.clear()
+        self._workers.clear()
+        self._houses.clear()
+
+    def _get_company(self, company_id):
+        """Компания по id; при первой загрузке поднимается и весь ее штат."""
+        company = self._companies.get(company_id)
+        if company is None:
+            (name,) = self.connection.execute(
+                "SELECT name FROM companies WHERE id = ?", (company_id,)
+            ).fetchone()
+            company = self._companies[company_id] = Company(name)
+            # Штат загружается целиком, иначе Company.employees был бы неполным
+            for worker_id, worker_name, qualification in self.connection.execute(
+                "SELECT id, name, qualification FROM workers WHERE company_id = ? ORDER BY id",
+                (company_id,),
+            ):
+                self._workers[worker_id] = Worker(worker_name, qualification, company)
+        return company
+
+    def get_workers(self, worker_ids):
+        """Рабочие по списку id (в том же порядке), недостающие — пачками из базы."""
+        missing = list(dict.fromkeys(i for i in worker_ids if i not in self._workers))
+        for start in range(0, len(missing), self.ID_BATCH):
+            batch = missing[start:start + self.ID_BATCH]
+            rows = self.connection.execute(
+                "SELECT id, name, qualification, company_id FROM workers"
+                f" WHERE id IN ({', '.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            for worker_id, name, qualification, company_id in rows:
+                if worker_id in self._workers:
+                    continue  # Уже пришел вместе со штатом своей компании
+                if company_id is None:
+                    self._workers[worker_id] = Worker(name, qualification)
+                else:
+                    self._get_company(company_id)
+        return [self._workers[worker_id] for worker_id in worker_ids]
+
+    def _get_house(self, row, worker_ids):
+        """Дом из строки запроса; объект создается один раз на id."""
+        house_id, address, floors, entrances, district, start, end = row
+        house = self._houses.get(house_id)
+        if house is None:
+            house = self._houses[house_id] = House(
+                address,
+                floors,
+                entrances,
+                district,
+                self.get_workers(worker_ids),
+                f"{start[8:10]}.{start[5:7]}.{start[:4]}",
+                f"{end[8:10]}.{end[5:7]}.{end[:4]}",
+            )
+        return house
+
+    def _registry_worker_ids(self):
+        return [
+            worker_id
+            for (worker_id,) in self.connection.execute(
+                "SELECT worker_id FROM registry_workers ORDER BY position"
+            )
+        ]
+
+    def _houses_in_range(self, first_day, last_day):
+        """Дома, срок которых пересекает [first_day, last_day], с составами.
+
+        Отбор идет по индексу дат; связи приходят по порядку домов
+        и позиций, поэтому состав каждого дома собирается за один проход.
+        """
+        rows = self.connection.execute(
+            "SELECT h.id, h.address, h.floors, h.entrances, h.district,"
+            " h.start_date, h.end_date, hw.worker_id"
+            " FROM houses h LEFT JOIN house_workers hw ON hw.house_id = h.id"
+            " WHERE h.start_date <= ? AND h.end_date >= ?"
+            " ORDER BY h.id, hw.position",
+            (last_day, first_day),
+        )
+        houses = []
+        current, worker_ids = None, []
+        for *house_row, worker_id in rows:
+            if current is not None and house_row[0] != current[0]:
+                houses.append(self._get_house(current, worker_ids))
+                worker_ids = []
+            current = house_row
+            if worker_id is not None:  # У дома без рабочих связей нет
+                worker_ids.append(worker_id)
+        if current is not None:
+            houses.append(self._get_house(current, worker_ids))
+        return houses
+
+    def show_worker_statistics(self, year):
+        """Тот же отчет, что Registry.show_worker_statistics, но из базы."""
+        worker_ids = self._registry_worker_ids()
+        workers = self.get_workers(worker_ids)
+        projects = {}
+        for house in self._houses_in_range(f"{year:04d}-01-01", f"{year:04d}-12-31"):
+            for worker in dict.fromkeys(house.workers):
+                projects.setdefault(worker, []).append(house)
+
+        print(f"\n--- Отчет по занятости рабочих за {year} год ---")
+        for worker in workers:
+            Registry._print_worker_projects(worker, projects.get(worker, []))
+
+    def project_counts(self, year):
+        """Сколько проектов было у каждого рабочего реестра за год — целиком в SQL.
+
+        Возвращает [(имя, количество), ...] в порядке реестра.
+        """
+        return self.connection.execute(
+            "SELECT w.name, COUNT(DISTINCT h.id)"
+            " FROM registry_workers rw JOIN workers w ON w.id = rw.worker_id"
+            " LEFT JOIN house_workers hw ON hw.worker_id = rw.worker_id"
+            " LEFT JOIN houses h ON h.id = hw.house_id"
+            " AND h.start_date <= ? AND h.end_date >= ?"
+            " GROUP BY rw.position ORDER BY rw.position",
+            (f"{year:04d}-12-31", f"{year:04d}-01-01"),
+        ).fetchall()
+
+    def load_registry(self):
+        """Поднимает весь реестр в память (например, для available_workers)."""
+        registry = Registry()
+        for worker in self.get_workers(self._registry_worker_ids()):
+            registry.add_worker(worker)
+        for house in self._houses_in_range("0000-01-01", "9999-12-31"):
+            registry.add_house(house)
+        return registry
+
+
+def _random_registry(worker_count, house_count, seed=1):
+    """Случайный реестр для замеров: дома на 1-3 рабочих, сроки до трех лет."""
+    rng = random.Random(seed)
+    companies = [Company(f"Компания {i}") for i in range(max(1, worker_count // 1000))]
+    registry = Registry()
+    workers = [
+        Worker(f"Рабочий {i}", "Маляр", rng.choice(companies))
+        for i in range(worker_count)
+    ]
+    for worker in workers:
+        registry.add_worker(worker)
+    for i in range(house_count):
+        start_year = rng.randint(2000, 2029)
+        end_year = start_year + rng.randint(0, 2)
+        registry.add_house(
+            House(
+                f"ул. Тестовая, {i}",
+                rng.randint(1, 25),
+                rng.randint(1, 6),
+                "Тестовый",
+                rng.sample(workers, rng.randint(1, 3)),
+                f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{start_year}",
+                f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{end_year}",
+            )
+        )
+    return registry
+
+
+def benchmark_statistics(worker_count=100_000, house_count=1_000_000, year=2015):
+    """Сравнивает отчет по индексу с исходным перебором рабочие x дома.
+
+    Полный перебор на таком объеме занял бы часы, поэтому он меряется на
+    части рабочих и пересчитывается на всех.
+    """
+    start = time.perf_counter()
+    registry = _random_registry(worker_count, house_count)
+    print(f"Реестр: {worker_count} рабочих, {house_count} домов, "
+          f"построен за {time.perf_counter() - start:.1f} с")
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        registry.show_worker_statistics(year)
+    indexed = time.perf_counter() - start
+
+    sample = Registry()
+    sample.houses = registry.houses
+    sample.workers = registry.workers[:20]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as reference_output:
+        sample.show_worker_statistics_reference(year)
+    reference = (time.perf_counter() - start) * worker_count / len(sample.workers)
+
+    # На выборке отчеты должны совпасть
+    sample._houses_by_year = registry._houses_by_year
+    with contextlib.redirect_stdout(io.StringIO()) as indexed_output:
+        sample.show_worker_statistics(year)
+    assert indexed_output.getvalue() == reference_output.getvalue()
+
+    print(f"Отчет по индексу: {indexed:.2f} с")
+    print(f"Перебор (оценка по {len(sample.workers)} рабочим): {reference:.0f} с")
+
+
+def benchmark_store(worker_count=20_000, house_count=200_000, year=2015, path=":memory:"):
+    """Замер хранилища SQLite: сохранение, отчет за год и подсчет в SQL."""
+    registry = _random_registry(worker_count, house_count)
+    with RegistryStore(path) as store:
+        start = time.perf_counter()
+        store.save_registry(registry)
+        saved = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) as stored_output:
+            store.show_worker_statistics(year)
+        report = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.project_counts(year)
+        counts = time.perf_counter() - start
+
+    with contextlib.redirect_stdout(io.StringIO()) as memory_output:
+        registry.show_worker_statistics(year)
+    assert stored_output.getvalue() == memory_output.getvalue()
+
+    print(f"SQLite: {worker_count} рабочих, {house_count} домов")
+    print(f" Сохранение: {saved:.2f} с ({house_count / saved:.0f} домов в секунду)")
+    print(f" Отчет за {year} год из базы: {report:.2f} с")
+    print(f" Подсчет проектов в SQL: {counts:.2f} с")
+
+
+def benchmark_rosters(worker_count=1_000_000, company_count=1000, seed=1):
+    """Память и время штатов на dict: найм, переводы, проверка состава, увольнения.
+
+    Для сравнения проверка "рабочий в составе" меряется и на списке
+    (как было раньше) — на части запросов с пересчетом на все.
+    """
+    rng = random.Random(seed)
+    companies = [Company(f"Компания {i}") for i in range(company_count)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    workers = [
+        Worker(f"Рабочий {i}", "Маляр", companies[i % company_count])
+        for i in range(worker_count)
+    ]
+    hired = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    moves = [(rng.choice(workers), rng.choice(companies)) for _ in range(worker_count)]
+    start = time.perf_counter()
+    for worker, company in moves:
+        worker.transfer_to(company)
+    transferred = time.perf_counter() - start
+    assert sum(len(company.employees) for company in companies) == worker_count
+    assert all(worker in worker.company.employees for worker in workers[:1000])
+
+    house = House("ул. Тестовая, 1", 25, 6, "Тестовый", workers, "01.01.2020", "31.12.2020")
+    probes = rng.sample(workers, 100_000)
+    start = time.perf_counter()
+    found = sum(worker in house.workers for worker in probes)
+    membership = time.perf_counter() - start
+    as_list = list(house.workers)
+    start = time.perf_counter()
+    assert sum(worker in as_list for worker in probes[:100]) == 100
+    membership_list = (time.perf_counter() - start) * len(probes) / 100
+
+    start = time.perf_counter()
+    for worker in workers:
+        worker.transfer_to(None)
+    removed = time.perf_counter() - start
+    assert found == len(probes) and not any(company.employees for company in companies)
+
+    print(f"Штаты: {worker_count} рабочих в {company_count} компаниях")
+    print(f" Найм: {hired:.2f} с, память {memory / worker_count:.0f} байт на рабочего")
+    print(f" Переводы ({len(moves)}): {transferred:.2f} с")
+    print(f" Проверка состава ({len(probes)}): dict {membership * 1000:.1f} мс, "
+          f"список (оценка) {membership_list:.0f} с")
+    print(f" Увольнения: {removed:.2f} с")
 
 
 # --- Основной блок программы ---
-if __name__ == "__main__":
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    benchmark_statistics()
+    benchmark_store()
+    benchmark_rosters()
+elif __name__ == "__main__":
     # Создаем компании
     stroy = Company("СтройГрупп")
     mega = Company("МегаДом")
@@ -116,6 +866,10 @@ if __name__ == "__main__":
     registry.add_house(House("пр. Мира, 5", 9, 2, "Западный", [w1, w3], "01.06.2022", "01.06.2023"))
     registry.add_house(House("ул. Северная, 2", 16, 1, "Северный", [w1], "01.01.2023", "01.12.2023"))
 
+    # Кто из маляров свободен летом 2023 года
+    free = registry.available_workers("01.06.2023", "31.08.2023", qualification="Маляр")
+    print("Свободные маляры летом 2023:", ", ".join(w.name for w in free) or "нет")
+
     # Интерактивная часть: запрашиваем год у пользователя
     try:
         user_year = int(input("Введите год для проверки статистики (например, 2022): "))
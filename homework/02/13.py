@@ -1,3 +1,10 @@
+import contextlib
+import io
+import os
+import time
+from array import array
+from functools import lru_cache
+
 # ==================================================
 # ЗАДАНИЕ 1
 # ==================================================
@@ -210,27 +217,126 @@ print()
 # РЕШЕНИЕ:
 # ==================================================
 
-class Calculator:
+@lru_cache(maxsize=4096)
+def _compile_expression(text):
+    """Разбирает строку один раз: массив знаков (+1/-1) и массив чисел."""
+    parts = text.split()
 
-    def calculate(self, text):
-        parts = text.split()
+    signs = array("b", [1])
+    operands = [int(parts[0])]
+
+    i = 1
+    while i < len(parts):
+        op = parts[i]
+        # Неизвестная операция, как и раньше, просто пропускает число
+        signs.append(1 if op == "+" else -1 if op == "-" else 0)
+        operands.append(int(parts[i + 1]))
+        i += 2
 
-        result = int(parts[0])
+    return signs, tuple(operands)
 
-        i = 1
-        while i < len(parts):
-            op = parts[i]
-            num = int(parts[i + 1])
 
-            if op == "+":
-                result += num
-            elif op == "-":
-                result -= num
+def _read_text_chunks(stream, chunk_size):
+    """Читает текстовый поток кусками до конца; бинарный поток не принимается."""
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        raise TypeError("calculate_stream ждёт текстовый поток, а не бинарный")
+    while chunk := stream.read(chunk_size):
+        if isinstance(chunk, (bytes, bytearray)):
+            raise TypeError("calculate_stream ждёт текстовый поток, а не бинарный")
+        yield chunk
+
+
+class Calculator:
+
+    def calculate(self, text):
+        signs, operands = _compile_expression(text)
 
-            i += 2
+        result = 0
+        for sign, num in zip(signs, operands):
+            result += sign * num
 
         return result
 
+    def calculate_stream(self, source, chunk_size=65536):
+        """Считает выражение за один проход, не собирая список токенов.
+
+        source — строка или текстовый поток (читается кусками по chunk_size).
+        Пробелы необязательны: "6-7+4" и "6 -  7 +4" дают одно и то же.
+        Перед числом допускается один знак, как у int(): "5 - -3".
+        """
+        if isinstance(source, str):
+            chunks = (source,)
+        else:
+            chunks = _read_text_chunks(source, chunk_size)
+
+        result = 0
+        op_sign = 1  # Знак операции перед текущим числом
+        num_sign = 1  # Собственный знак числа
+        number = 0
+        # Состояния: "operand" — ждём число, "number" — читаем цифры,
+        # "operator" — число закончилось пробелом, ждём + или -
+        state = "operand"
+        sign_seen = False
+
+        for chunk in chunks:
+            for char in chunk:
+                if "0" <= char <= "9":
+                    if state == "operator":
+                        raise ValueError("Между числами пропущен знак операции")
+                    number = number * 10 + (ord(char) - 48)
+                    state = "number"
+                elif char == "+" or char == "-":
+                    sign = 1 if char == "+" else -1
+                    if state == "operand":
+                        if sign_seen:
+                            raise ValueError("Два знака подряд перед числом")
+                        num_sign = sign
+                        sign_seen = True
+                    else:
+                        result += op_sign * num_sign * number
+                        op_sign, num_sign, number = sign, 1, 0
+                        state = "operand"
+                        sign_seen = False
+                elif char.isspace():
+                    if state == "number":
+                        state = "operator"
+                else:
+                    raise ValueError(f"Недопустимый символ: {char!r}")
+
+        if state == "operand":
+            raise ValueError("Выражение обрывается без числа")
+        return result + op_sign * num_sign * number
+
+    def calculate_many(self, source, report_every=100_000):
+        """Считает выражения из файла построчно и печатает скорость обработки.
+
+        source — путь к файлу или открытый текстовый поток. Пустые строки
+        пропускаются. Возвращает генератор результатов.
+        """
+        start = time.perf_counter()
+        count = 0
+        # Открытый здесь файл закрывается и тогда, когда генератор закрывают на полпути
+        with contextlib.ExitStack() as stack:
+            stream = source
+            if isinstance(source, (str, os.PathLike)):
+                stream = stack.enter_context(open(source, encoding="utf-8"))
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                yield self.calculate(line)
+                count += 1
+                if count % report_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"Обработано {count} строк, {count / elapsed:.0f} строк/с")
+
+        elapsed = time.perf_counter() - start
+        if count:
+            print(
+                f"Итого {count} строк за {elapsed:.2f} с, "
+                f"{count / elapsed:.0f} строк/с"
+            )
+
 
 calc = Calculator()
 
@@ -248,3 +354,13 @@ print()
 print("Пример:", example2)
 print("Результат:", calc.calculate(example2))
 print()
+
+# Потоковый расчёт: пробелы необязательны, список токенов не строится
+print("Поток:", calc.calculate_stream("12-19 +1"))
+print("Поток из файла:", calc.calculate_stream(io.StringIO("1 - 3 + 10")))
+print()
+
+# Пакетный расчёт: каждая строка файла — отдельное выражение
+ledger = io.StringIO("12 - 19 + 1\n1 - 3 + 10\n\n100 - 1 - 1\n")
+print("Пакет:", list(calc.calculate_many(ledger)))
+print()